@@ -0,0 +1 @@
+"""Shared data and scoring helpers used by the H-APP-Y Streamlit pages."""
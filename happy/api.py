@@ -0,0 +1,359 @@
+"""
+Headless recommendation API.
+
+Serves the same recommenders as the Streamlit pages as JSON, over a small
+asyncio HTTP/1.1 server (GET only, keep-alive), with no Streamlit rerun or
+rendering in the path:
+
+    python -m happy.api --port 8000 [--workers 4]
+
+Endpoints:
+
+    GET /recommend/body?feeling=energetic&type=Veg
+    GET /recommend/mood?rating=2&category=Veg
+    GET /recommend/soul?limit=10[&w_protein=0.2 ...]
+    GET /recommend/texture?texture=crispy
+    GET /recommend/disorders?condition=diabetes[,lactose,nut&weights=2,1,1]
+    GET /recommend/swap?item=McVeggie Burger&objective=lean
+    GET /recommend/combo?slots=regular,regular,beverages&objective=mood&max_kcal=800
+    GET /search?q=mcaloo tik&limit=10
+    GET /health
+    GET /ready
+    GET /stats
+
+Every endpoint takes an optional ``region`` (a catalog region, default
+India; see ``catalog.py``). Choices match the page labels case-insensitively, ignoring emoji and
+punctuation ("avoid bloating", "pcos/pcod"). Every handler reads the shared,
+per-data-version frames from the ``happy`` modules, and rendered responses
+are kept in the shared result cache (``results.py``) per (endpoint,
+parameters, data version), so repeated queries only cost the HTTP round
+trip. ``/stats`` reports the cache's hit/miss/eviction counters, and
+``--metrics-file`` exports the per-stage latencies (``timing.py``) in
+Prometheus text format.
+
+The server accepts connections right away and warms every region's tables
+in the background (``warmup.py``). ``/health`` answers as soon as it
+listens; ``/ready`` answers 503 until warm-up has finished, so a load
+balancer can hold traffic until then. Requests are answered in a thread
+pool, so one that has to build a cold table doesn't hold up the others (or
+the probes, which are answered on the event loop).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import os
+import re
+from urllib.parse import parse_qsl, urlsplit
+
+from happy import (
+    body, catalog, combos, disorders, ingredients, menu_store, mood, results, search, soul, swaps, texture, timing,
+    warmup,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BadRequest(ValueError):
+    """A query parameter is missing or invalid (answered with 400)."""
+
+
+# ------------------------------
+# Parameter Parsing
+# ------------------------------
+def _plain(text):
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def _choice(params, name, options, default=None):
+    """Resolves a parameter to one of ``options`` (exact plain match, else unique prefix)."""
+    value = params.get(name, default)
+    if value is None:
+        raise BadRequest(f"missing parameter '{name}'")
+    wanted = _plain(value)
+    exact = [opt for opt in options if _plain(opt) == wanted]
+    prefix = [opt for opt in options if wanted and _plain(opt).startswith(wanted)]
+    if exact or len(prefix) == 1:
+        return (exact or prefix)[0]
+    raise BadRequest(f"'{name}' must be one of: {', '.join(options)}")
+
+
+def _number(params, name, cast, default, lo=None, hi=None):
+    value = params.get(name)
+    try:
+        value = default if value is None else cast(value)
+    except ValueError:
+        raise BadRequest(f"'{name}' must be a number")
+    if value is None:
+        return None
+    if not math.isfinite(value):
+        raise BadRequest(f"'{name}' must be a finite number")  # NaN passes every range check
+    if (lo is not None and value < lo) or (hi is not None and value > hi):
+        raise BadRequest(f"'{name}' must be between {lo} and {hi}")
+    return value
+
+
+def _region(params):
+    names = list(catalog.regions())
+    return catalog.region(_choice(params, "region", names, default=catalog.DEFAULT_REGION))
+
+
+def _records(df):
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+# ------------------------------
+# Endpoint Handlers
+# ------------------------------
+def recommend_body(params):
+    feeling = _choice(params, "feeling", list(body.FEELING_MAP))
+    meal_type = _choice(params, "type", body.MEAL_TYPES)
+    limit = _number(params, "limit", int, 5, 1, 100)
+    region = _region(params)
+    return {"region": region.name, "feeling": feeling, "type": meal_type,
+            "items": _records(body.cached_meals(region.menu_new, feeling, meal_type, limit))}
+
+
+def recommend_mood(params):
+    rating = _number(params, "rating", int, None, 1, 10)
+    if rating is None:
+        raise BadRequest("missing parameter 'rating'")
+    category = _choice(params, "category", ["Veg", "Non-Veg"])
+    limit = _number(params, "limit", int, 3, 1, 100)
+    region = _region(params)
+
+    top = mood.cached_items(region.menu_new, rating, category, limit)
+    columns = ["Menu Items", "Energy (kCal)", "Total carbohydrate (g)", "Protein (g)",
+               "Total Sugars (g)", "Mood Support Score"]
+    return {"region": region.name, "rating": rating, "category": category, "items": _records(top[columns])}
+
+
+def recommend_soul(params):
+    limit = _number(params, "limit", int, 10, 1, 100)
+    weights = {key: _number(params, key, float, default, 0.0, 1.0)
+               for key, default in soul.DEFAULT_WEIGHTS.items()}
+    region = _region(params)
+
+    high, low = soul.cached_vibe_tables(region.menu, weights, limit)
+    return {"region": region.name, "weights": weights, "high": _records(high), "low": _records(low)}
+
+
+def recommend_texture(params):
+    choice = _choice(params, "texture", texture.TEXTURES)
+    limit = _number(params, "limit", int, 10, 1, 100)
+    region = _region(params)
+    return {"region": region.name, "texture": choice, "feeling": texture.texture_feeling(choice),
+            "items": _records(texture.cached_items_with_texture(region.menu, choice, limit))}
+
+
+def recommend_disorders(params):
+    conditions = [_choice({"condition": value}, "condition", disorders.CONDITIONS)
+                  for value in params.get("condition", "").split(",") if value]
+    if not conditions:
+        raise BadRequest("missing parameter 'condition'")
+    region = _region(params)
+    if len(conditions) == 1:
+        return {"region": region.name, "condition": conditions[0],
+                "items": _records(disorders.cached_recommendations(region.menu, conditions[0]))}
+
+    values = params.get("weights", "").split(",") if "weights" in params else ["1"] * len(conditions)
+    if len(values) != len(conditions):
+        raise BadRequest("'weights' must give one weight per condition")
+    weights = {condition: _number({"weights": value}, "weights", float, None, 0.0, 1000.0)
+               for condition, value in zip(conditions, values)}
+    return {"region": region.name, "conditions": conditions, "weights": weights,
+            "items": _records(disorders.cached_blended_recommendations(region.menu, weights))}
+
+
+def recommend_swap(params):
+    item = params.get("item")
+    if not item:
+        raise BadRequest("missing parameter 'item'")
+    labels = {label: objective for objective, label in swaps.OBJECTIVES.items()}
+    objective = labels[_choice(params, "objective", list(labels), default=swaps.OBJECTIVES["vibrational_score"])]
+    limit = _number(params, "limit", int, 5, 1, 100)
+    region = _region(params)
+    try:
+        items = swaps.healthier_swaps(region.menu_new, item, objective, limit)
+    except KeyError:
+        raise BadRequest(f"unknown item '{item}'")
+    return {"region": region.name, "item": item, "objective": objective, "items": _records(items)}
+
+
+def recommend_combo(params):
+    region = _region(params)
+    categories = list(dict.fromkeys(combos.load_combo_table(region.menu)["Menu Category"]))
+    slots = [_choice({"slots": slot}, "slots", categories) for slot in params.get("slots", "").split(",") if slot]
+    if not 1 <= len(slots) <= 5:
+        raise BadRequest("'slots' must list 1 to 5 menu categories")
+    labels = {label: objective for objective, label in combos.OBJECTIVES.items()}
+    objective = labels[_choice(params, "objective", list(labels), default=combos.OBJECTIVES["vibrational_score"])]
+    condition = _choice(params, "condition", disorders.CONDITIONS) if "condition" in params else None
+    caps = {col: _number(params, f"max_{short}", float, combos.DEFAULT_CAPS.get(col), 0.0)
+            for col, short in combos.CAPS.items()}
+
+    items, exact = combos.cached_combo(region.menu, slots, objective, caps, condition)
+    totals = items[[col for col, cap in caps.items() if cap is not None]].sum().round(2)
+    return {"region": region.name, "slots": slots, "objective": objective, "condition": condition,
+            "caps": {col: cap for col, cap in caps.items() if cap is not None}, "exact": exact,
+            "items": _records(items), "totals": totals.to_dict()}
+
+
+def search_items(params):
+    query = params.get("q", "")
+    if not query.strip():
+        raise BadRequest("missing parameter 'q'")
+    limit = _number(params, "limit", int, 10, 1, 100)
+    region = _region(params)
+    return {"region": region.name, "q": query, "items": _records(search.search_items(region.menu, query, limit))}
+
+
+ROUTES = {
+    "/recommend/body": recommend_body,
+    "/recommend/mood": recommend_mood,
+    "/recommend/soul": recommend_soul,
+    "/recommend/texture": recommend_texture,
+    "/recommend/disorders": recommend_disorders,
+    "/recommend/swap": recommend_swap,
+    "/recommend/combo": recommend_combo,
+    "/search": search_items,
+}
+
+
+def _menu_version(name):
+    try:
+        return menu_store.menu_version(name)
+    except Exception:
+        return None  # Unreadable: only that region's endpoints fail, not every one
+
+
+def data_version():
+    """Combined content hash of every menu file and ingredients table the endpoints read."""
+    return tuple(
+        (part.name, _menu_version(part.menu), _menu_version(part.menu_new), ingredients.table_version(part.menu))
+        for part in catalog.regions().values()
+    )
+
+
+def _render(path, query):
+    try:
+        status, payload = 200, ROUTES[path](dict(query))
+    except BadRequest as e:
+        status, payload = 400, {"error": str(e)}
+    with timing.page("api"), timing.stage("render"):
+        return status, json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def dispatch(method, target):
+    """Answers one request; returns ``(status, JSON body bytes)``."""
+    url = urlsplit(target)
+    if url.path == "/health":
+        return 200, b'{"status":"ok"}'
+    if url.path == "/ready":
+        return (200 if warmup.is_ready() else 503), json.dumps({"warmup": warmup.status()}).encode("utf-8")
+    if url.path == "/stats":
+        return 200, json.dumps({"result_cache": results.stats()}).encode("utf-8")
+    if url.path not in ROUTES:
+        return 404, b'{"error":"not found"}'
+    if method not in ("GET", "HEAD"):
+        return 405, b'{"error":"method not allowed"}'
+
+    query = tuple(sorted(parse_qsl(url.query)))
+    return results.remember("api", (url.path, query), data_version(), lambda: _render(url.path, query))
+
+
+# ------------------------------
+# HTTP Server
+# ------------------------------
+PROBES = ("/health", "/ready", "/stats")  # Answered on the event loop: they never build anything
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+async def handle_connection(reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, version = request_line.decode("latin-1").split()
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip().lower()
+            if "content-length" in headers:
+                await reader.readexactly(int(headers["content-length"]))
+
+            try:
+                if urlsplit(target).path in PROBES:
+                    status, payload = dispatch(method, target)
+                else:
+                    status, payload = await asyncio.get_running_loop().run_in_executor(None, dispatch, method, target)
+            except Exception:
+                logger.exception("%s %s failed", method, target)
+                status, payload = 500, b'{"error":"internal error"}'
+
+            connection = headers.get("connection", "")
+            keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+            head = (
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            ).encode("latin-1")
+            writer.write(head if method == "HEAD" else head + payload)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        pass  # Malformed request or client went away
+    finally:
+        writer.close()
+
+
+async def serve(host, port, reuse_port=False):
+    warmup.start()
+    server = await asyncio.start_server(handle_connection, host, port, reuse_port=reuse_port, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+
+def _run_worker(host, port, reuse_port, metrics_file=None):
+    if metrics_file:
+        # Each worker has its own histograms, so each writes its own file.
+        timing.start_exporter(f"{metrics_file}.{os.getpid()}" if reuse_port else metrics_file)
+    asyncio.run(serve(host, port, reuse_port))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve H-APP-Y recommendations as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes sharing the port via SO_REUSEPORT (Linux)")
+    parser.add_argument("--metrics-file", help="write stage latencies here in Prometheus text format every 15 s")
+    args = parser.parse_args(argv)
+
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} worker(s)")
+    if args.workers == 1:
+        _run_worker(args.host, args.port, False, args.metrics_file)
+        return
+
+    workers = [multiprocessing.Process(target=_run_worker, args=(args.host, args.port, True, args.metrics_file))
+               for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
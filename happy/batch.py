@@ -0,0 +1,258 @@
+"""
+Out-of-core batch scoring.
+
+The pages load a whole menu into memory and min-max normalize over it.
+``python -m happy.batch`` scores menu CSVs of any size in two streaming
+passes with bounded memory:
+
+    python -m happy.batch huge_menu.csv scores.csv [--chunksize 100000]
+
+1. The first pass reads the file in chunks and accumulates, per feature,
+   the global min/max, sum/count (for mean fills) and, for median fills
+   (including the serving weight fill), a histogram of the top 16 bits of
+   each value's order-preserving 64-bit key.
+2. Median fills are then found exactly by radix selection: each further
+   pass counts the next 16 key bits of the values that can still be the
+   middle ones, until few enough remain to collect and sort (usually one
+   or two passes, never more than three).
+3. The last pass reads it again and scores each chunk with a
+   :class:`~happy.scoring.ScoringEngine` built on those global statistics,
+   appending the vibrational, body-feeling, mood and disorder scores to the
+   output file.
+
+Each chunk is scored exactly as if the whole file had been loaded. Disorder
+scores are normalized over the whole file, not over the page's filtered
+subset. Memory holds one chunk plus, per median-filled column, a
+65536-bin histogram or at most :data:`EXACT_LIMIT` candidate values,
+whatever the input size.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from happy import features, menu_store
+from happy.mood import MOOD_BUCKETS, mood_score_table
+from happy.scoring import ALL_SCORES, ScoringEngine, feature_keys
+
+ID_COLUMNS = ["Menu Category", "Menu Items", "Veg/Non-Veg"]
+MOOD_COLUMNS = {bucket: f"Mood_{bucket.title()}_Score" for bucket in MOOD_BUCKETS}
+KEY_BITS = 16             # Key bits resolved per median pass
+EXACT_LIMIT = 1 << 16     # Candidates few enough to collect and sort
+_SIGN = np.uint64(1 << 63)
+
+
+def _keys(values):
+    """Order-preserving uint64 keys of float values."""
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    return np.where(bits & _SIGN, ~bits, bits | _SIGN)
+
+
+def _value(key):
+    bits = np.uint64(key)
+    return float((bits & ~_SIGN if bits & _SIGN else ~bits).view(np.float64))
+
+
+class _RankSelect:
+    """Radix selection of the value of one rank (0-based, ascending) of a streamed column."""
+
+    def __init__(self, rank, top):
+        self.rank = rank          # Rank among the values whose key starts with prefix
+        self.prefix = 0           # Resolved high key bits
+        self.shift = 64           # Key bits below the prefix
+        self.counts = top         # Histogram of the next KEY_BITS bits (this pass)
+        self.values = None        # Candidate keys (this pass), once few enough
+        self.value = None
+        self.end_pass()
+
+    def update(self, keys):
+        if self.value is not None:
+            return
+        if self.shift < 64:
+            keys = keys[keys >> np.uint64(self.shift) == np.uint64(self.prefix)]
+        if self.values is not None:
+            self.values.append(keys)
+        else:
+            digits = (keys >> np.uint64(self.shift - KEY_BITS)) & np.uint64((1 << KEY_BITS) - 1)
+            self.counts += np.bincount(digits.astype(np.int64), minlength=1 << KEY_BITS)
+
+    def end_pass(self):
+        if self.value is not None:
+            return
+        if self.values is not None:
+            self.value = _value(np.sort(np.concatenate(self.values))[self.rank])
+            return
+        cumulative = self.counts.cumsum()
+        digit = int(np.searchsorted(cumulative, self.rank, side="right"))
+        self.rank -= int(cumulative[digit - 1]) if digit else 0
+        self.prefix = (self.prefix << KEY_BITS) | digit
+        self.shift -= KEY_BITS
+        if not self.shift:
+            self.value = _value(self.prefix)
+        elif self.counts[digit] <= EXACT_LIMIT:
+            self.values = []
+        else:
+            self.counts = np.zeros(1 << KEY_BITS, dtype=np.int64)
+
+
+class ColumnStats:
+    """
+    Running min/max/mean of one column, and optionally its exact median,
+    which takes further passes over the data (:meth:`refine`).
+    """
+
+    def __init__(self, track_median=False):
+        self.min = np.inf
+        self.max = -np.inf
+        self.sum = 0.0
+        self.count = 0
+        self.top = np.zeros(1 << KEY_BITS, dtype=np.int64) if track_median else None  # First key digits
+        self.selects = None
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.sum += values.sum()
+        self.count += len(values)
+        if self.top is not None:
+            self.top += np.bincount((_keys(values) >> np.uint64(64 - KEY_BITS)).astype(np.int64),
+                                    minlength=1 << KEY_BITS)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else np.nan
+
+    @property
+    def median_pending(self):
+        """Whether the median needs another pass through :meth:`refine` and :meth:`end_pass`."""
+        if self.top is None or not self.count:
+            return False
+        if self.selects is None:
+            # Middle value, or the two middle values, as np.median.
+            self.selects = [_RankSelect(rank, self.top) for rank in {(self.count - 1) // 2, self.count // 2}]
+        return any(select.value is None for select in self.selects)
+
+    def refine(self, values):
+        values = np.asarray(values, dtype=float)
+        keys = _keys(values[~np.isnan(values)])
+        for select in self.selects:
+            select.update(keys)
+
+    def end_pass(self):
+        for select in self.selects:
+            select.end_pass()
+
+    @property
+    def median(self):
+        if self.median_pending:
+            raise RuntimeError("median needs more passes")
+        if not self.count:
+            return np.nan
+        return sum(select.value for select in self.selects) / len(self.selects)
+
+    def bounds(self):
+        return (self.min, self.max) if self.min <= self.max else (np.nan, np.nan)
+
+
+# ------------------------------
+# Pass 1: Global Statistics
+# ------------------------------
+def collect_stats(path, chunksize, specs=ALL_SCORES):
+    """
+    Streams ``path`` once and returns ``(stats, weight_fill, rows)``: the
+    engine's ``{key: (fill value, min, max)}`` statistics over the whole
+    file, the median serving weight and the row count.
+    """
+    keys = feature_keys(specs)
+    medians = {feature for feature, fill, _ in keys if fill == "median"}
+    columns = {
+        feature: ColumnStats(track_median=feature in medians)
+        for feature, fill, raw in keys if fill is not None or not raw
+    }
+    weight = ColumnStats(track_median=True)
+    # energy_density depends on the weight fill, which is only known at the
+    # end: its bounds over unparseable sizes come from their energy instead.
+    unweighted_energy = ColumnStats()
+
+    rows = 0
+    for chunk in menu_store.iter_menu_chunks(path, chunksize):
+        df = features.add_derived_columns(chunk, weight_fill=np.nan)
+        for feature, stats in columns.items():
+            stats.update(df[feature])
+        weight.update(df['serve_weight'])
+        unweighted_energy.update(df.loc[df['serve_weight'].isna(), 'Energy (kCal)'])
+        rows += len(df)
+
+    tracked = {feature: stats for feature, stats in columns.items() if stats.top is not None}
+    tracked["serve_weight"] = weight
+    while any(stats.median_pending for stats in tracked.values()):
+        for chunk in menu_store.iter_menu_chunks(path, chunksize):
+            df = features.add_derived_columns(chunk, weight_fill=np.nan)
+            for feature, stats in tracked.items():
+                if stats.median_pending:
+                    stats.refine(df[feature])
+        for stats in tracked.values():
+            if stats.median_pending:
+                stats.end_pass()
+
+    weight_fill = weight.median
+    if "energy_density" in columns and unweighted_energy.count and weight_fill > 0:
+        density = columns["energy_density"]
+        density.min = min(density.min, unweighted_energy.min / weight_fill)
+        density.max = max(density.max, unweighted_energy.max / weight_fill)
+
+    stats = {}
+    for key in keys:
+        feature, fill, raw = key
+        column = columns.get(feature)
+        fill_value = getattr(column, fill) if fill is not None else np.nan
+        lo, hi = (np.nan, np.nan) if raw else column.bounds()
+        stats[key] = (fill_value, lo, hi)
+    return stats, weight_fill, rows
+
+
+# ------------------------------
+# Pass 2: Scoring
+# ------------------------------
+def score_chunk(chunk, stats, weight_fill, specs=ALL_SCORES):
+    """Every score of one chunk, normalized with whole-file statistics."""
+    df = features.add_derived_columns(chunk, weight_fill=weight_fill)
+    scores = ScoringEngine(df, specs, stats=stats).scores()
+    mood = mood_score_table(df).rename(columns=MOOD_COLUMNS)
+
+    ids = df[[col for col in ID_COLUMNS if col in df.columns]]
+    return pd.concat([ids, scores, mood], axis=1)
+
+
+def score_file(path, output, chunksize=100_000, specs=ALL_SCORES):
+    """Scores the menu CSV at ``path`` into ``output`` in two streaming passes."""
+    stats, weight_fill, rows = collect_stats(path, chunksize, specs)
+
+    header = True
+    for chunk in menu_store.iter_menu_chunks(path, chunksize):
+        score_chunk(chunk, stats, weight_fill, specs).to_csv(
+            output, mode="w" if header else "a", header=header, index=False
+        )
+        header = False
+    if header:  # Empty input: still write the header
+        score_chunk(menu_store.parse_menu(path), stats, weight_fill, specs).to_csv(output, index=False)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a large menu CSV in bounded memory.")
+    parser.add_argument("menu", help="menu CSV to score")
+    parser.add_argument("output", help="CSV file to write the scores to (.gz etc. compress)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk")
+    args = parser.parse_args(argv)
+
+    rows = score_file(menu_store.resolve_path(args.menu), args.output, args.chunksize)
+    print(f"{args.menu}: {rows} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
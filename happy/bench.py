@@ -0,0 +1,161 @@
+"""
+Benchmark suite over synthetic menus.
+
+Generates menus of 1k to 1M rows with the India menu schema (sampled from
+the real items, with jittered nutrients and name variants) and times every
+stage each page goes through, using the same ``happy`` functions the pages
+call:
+
+- ``load``: parsing the CSV (``menu_store.parse_menu``)
+- ``classify``: derived columns (``features``) and allergen flags
+  (``ingredients``)
+- ``score``: the scoring engine, mood table, Body clusters and soul weights
+- ``rank``: every recommendation the page can show
+
+Stages shared by several pages are reported under ``page: "all"``. Results
+go to a JSON file for tracking regressions:
+
+    python -m happy.bench [--sizes 1000 10000 100000 1000000] [--repeat 3] [--output bench_results.json]
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from happy import body, disorders, features, menu_store, mood, soul, texture
+from happy.ingredients import build_ingredient_matrix
+from happy.ranking import top_k_rows
+from happy.scoring import ScoringEngine
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+NAME_VARIANTS = ["", " (S)", " (M)", " (L)", " Meal", " Combo", " Deluxe", " Spicy", " Crispy", " Grilled"]
+MISSING_SIZE_SHARE = 0.02
+
+
+def synthetic_menu(rows, seed=0, source=menu_store.MENU_NEW_FILE):
+    """A ``rows``-item menu with the same schema and value ranges as ``source``."""
+    rng = np.random.default_rng(seed)
+    base = menu_store.parse_menu(menu_store.resolve_path(source))
+    df = base.iloc[rng.integers(0, len(base), rows)].reset_index(drop=True)
+
+    variants = np.array(NAME_VARIANTS, dtype=object)[rng.integers(0, len(NAME_VARIANTS), rows)]
+    df["Menu Items"] = df["Menu Items"].astype(object) + variants
+
+    for col in menu_store.NUTRIENT_COLUMNS:
+        if col in df.columns:
+            df[col] = (df[col] * rng.lognormal(0.0, 0.2, rows)).round(2)
+
+    weight = features.serve_weight(df) * rng.lognormal(0.0, 0.1, rows)
+    sizes = pd.Series(weight.round().astype(int).astype(str) + " g", dtype=object)
+    sizes[rng.random(rows) < MISSING_SIZE_SHARE] = "n/a"
+    df["Per Serve Size"] = sizes
+    return df
+
+
+@contextmanager
+def _timer(results, page, stage):
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    key = (page, stage)
+    results[key] = min(results.get(key, elapsed), elapsed)
+
+
+def run_pipeline(path, results):
+    """Runs every page's stages once on the menu CSV at ``path``."""
+    with _timer(results, "all", "load"):
+        menu = menu_store.parse_menu(path)
+    with _timer(results, "all", "classify"):
+        featured = features.add_derived_columns(menu)
+    with _timer(results, "all", "score"):
+        engine = ScoringEngine(featured)
+
+    # ---- Body ----
+    with _timer(results, "body", "score"):
+        body_df = body.build_body_data(menu, engine.scores())
+    with _timer(results, "body", "rank"):
+        for feeling in body.FEELING_MAP:
+            for meal_type in body.MEAL_TYPES:
+                body.recommend_meals(body_df, feeling, meal_type)
+
+    # ---- Mood ----
+    with _timer(results, "mood", "score"):
+        scores = mood.mood_score_table(featured)
+    with _timer(results, "mood", "rank"):
+        for rating in (2, 8):
+            scored = mood.calculate_mood_score(featured, rating, scores)
+            for category in ("Veg", "Non-Veg"):
+                mood.recommend_items(scored, category)
+
+    # ---- Soul ----
+    with _timer(results, "soul", "score"):
+        vibes = featured.assign(vibrational_score=soul.vibrational_scores(engine))
+    with _timer(results, "soul", "rank"):
+        top_k_rows(vibes, "vibrational_score", 10, mask=vibes["is_veg"] == 1)
+        top_k_rows(vibes, "vibrational_score", 10, ascending=True)
+
+    # ---- Texture ----
+    with _timer(results, "texture", "rank"):
+        for choice in texture.TEXTURES:
+            texture.items_with_texture(featured, choice)
+
+    # ---- Disorders ----
+    with _timer(results, "disorders", "classify"):
+        flagged = menu.join(build_ingredient_matrix(menu).group_columns(menu.index))
+    with _timer(results, "disorders", "rank"):
+        for condition in disorders.CONDITIONS:
+            disorders.recommend_for_condition(flagged, condition, engine)
+
+
+def run(sizes=DEFAULT_SIZES, repeat=1, seed=0, log=sys.stderr):
+    """Benchmarks every size; returns the JSON-ready report."""
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = Path(tmp) / f"menu_{rows}.csv"
+            synthetic_menu(rows, seed).to_csv(path, index=False)
+            results = {}
+            for _ in range(repeat):
+                run_pipeline(path, results)
+            for (page, stage), seconds in results.items():
+                records.append({"rows": rows, "page": page, "stage": stage, "seconds": round(seconds, 6)})
+                print(f"{rows:>9} {page:<10} {stage:<9} {seconds * 1000:10.1f} ms", file=log)
+            path.unlink()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": records,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every page's stages on synthetic menus.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="menu sizes in rows")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size (best time is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json", help="JSON report path")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.repeat, args.seed)
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Wrote {len(report['results'])} timings to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
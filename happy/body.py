@@ -0,0 +1,73 @@
+"""
+Body page recommendations: meals that match how you want to feel.
+
+Feeling scores are declared in ``scoring.py``; :func:`load_body_data` joins
+them to the menu and clusters items by their score profile, once per data
+version. The cluster model is persisted per data version (``clusters.py``),
+and recommendations are shared across sessions (``results.py``).
+"""
+from happy import clusters, menu_store, results, timing
+from happy.ranking import top_k_rows
+from happy.scoring import BODY_SCORES, load_engine
+
+FEELING_MAP = {
+    "⚡ Energetic": "Energetic_Score",
+    "🏋️ Lean": "Lean_Score",
+    "🍛 Satiated": "Satiated_Score",
+    "💨 Avoid Bloating": "Avoid_Bloating_Score"
+}
+MEAL_TYPES = ["Veg", "Non-Veg"]
+
+
+SCORE_NAMES = [spec.name for spec in BODY_SCORES]
+
+
+def build_body_data(df, scores, model=None):
+    """
+    Joins the feeling scores to the menu and adds the ``Cluster`` of each
+    item (from ``model``, else a fresh fit).
+    """
+    df_scaled = df[["Menu Items", "Menu Category", "Veg/Non-Veg"]].join(scores[SCORE_NAMES].astype(float))
+
+    X = df_scaled[SCORE_NAMES].to_numpy()
+    if model is None:
+        model = clusters.fit_model(menu_store.row_hashes(df), X)
+    df_scaled["Cluster"] = model.predict(X)
+
+    return df_scaled
+
+
+def body_features(name=menu_store.MENU_NEW_FILE):
+    """Row content hashes and the feeling-score matrix the clusters are built on."""
+    return menu_store.menu_row_hashes(name), load_engine(name).scores()[SCORE_NAMES].to_numpy(dtype=float)
+
+
+@menu_store.versioned_cache(maxsize=8)
+def _cached_body_data(name, version):
+    hashes, X = body_features(name)
+    engine = load_engine(name)
+    model = clusters.load_model(name, version, hashes, X, engine.extremes(BODY_SCORES),
+                                menu_store.previous_version(name))
+    return build_body_data(menu_store.load_menu(name), engine.scores(), model)
+
+
+def load_body_data(name=menu_store.MENU_NEW_FILE):
+    """The scored and clustered Body frame, built once per data version."""
+    return _cached_body_data(name, menu_store.menu_version(name)).copy(deep=False)
+
+
+def recommend_meals(df, feeling, meal_type, top_n=5):
+    """Top items of ``meal_type`` by the score behind ``feeling``."""
+    top_meals = top_k_rows(df, FEELING_MAP[feeling], top_n, mask=df["Veg/Non-Veg"] == meal_type)
+    return top_meals[["Menu Items", "Menu Category", "Veg/Non-Veg"]]
+
+
+def cached_meals(name, feeling, meal_type, top_n=5):
+    """:func:`recommend_meals` for a menu file, from the shared result cache."""
+    def compute():
+        with timing.page("body"):
+            with timing.stage("load"):
+                df = load_body_data(name)
+            return recommend_meals(df, feeling, meal_type, top_n)
+
+    return results.remember("body", (name, feeling, meal_type, top_n), menu_store.menu_version(name), compute)
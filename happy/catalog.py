@@ -0,0 +1,146 @@
+"""
+Multi-region menu catalog.
+
+Each region is a partition of menu files named like the India pair:
+
+- ``<Region>_Menu.csv``, read by the soul, texture and disorders pages
+- ``<Region>_Menu_New.csv``, read by the body and mood pages
+
+found in the repository root or in ``menus/``. A region needs both files.
+Underscores in the region name become spaces (``South_Africa_Menu.csv`` is
+"South Africa").
+
+Cross-region rankings need every partition's derived features and scores.
+:func:`score_regions` computes them per partition in a process pool and
+merges the results; :func:`load_all_scores` does so once per catalog
+version. Scores are normalized within each region's menu, as on the pages.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from happy import menu_store
+from happy.scoring import load_engine
+
+MENU_DIRS = [menu_store.ROOT, menu_store.ROOT / "menus"]
+DEFAULT_REGION = "India"
+# Below this combined CSV size, starting worker processes costs more than
+# scoring every partition in-process.
+PARALLEL_MIN_BYTES = 32 * 2**20
+
+
+@dataclass(frozen=True)
+class Region:
+    name: str
+    menu: str
+    menu_new: str
+
+
+def _menu_name(path):
+    # Root files keep their bare name, so caches and snapshots stay keyed as before.
+    try:
+        return str(path.relative_to(menu_store.ROOT))
+    except ValueError:
+        return str(path)
+
+
+def discover(dirs=None):
+    """Finds every region's menu files; the first directory wins on duplicates."""
+    regions = {}
+    for directory in dirs or MENU_DIRS:
+        for path in sorted(Path(directory).glob("*_Menu.csv")):
+            stem = path.name[: -len("_Menu.csv")]
+            new = path.with_name(f"{stem}_Menu_New.csv")
+            if new.exists():
+                name = stem.replace("_", " ")
+                regions.setdefault(name, Region(name, _menu_name(path), _menu_name(new)))
+    return regions
+
+
+def _dir_stamps(dirs):
+    # Adding, removing or renaming a menu file changes its directory's mtime.
+    stamps = []
+    for directory in dirs:
+        try:
+            stamps.append((str(directory), os.stat(directory).st_mtime_ns))
+        except FileNotFoundError:
+            stamps.append((str(directory), None))
+    return tuple(stamps)
+
+
+@lru_cache(maxsize=4)
+def _cached_regions(stamps):
+    found = discover()
+    ordered = sorted(found, key=lambda name: (name != DEFAULT_REGION, name))
+    return {name: found[name] for name in ordered}
+
+
+def regions():
+    """
+    ``{name: Region}`` for the current catalog, the default region first,
+    discovered again only when a menu directory changes.
+    """
+    return dict(_cached_regions(_dir_stamps(MENU_DIRS)))
+
+
+def region(name=DEFAULT_REGION):
+    """Looks up one region by name (``KeyError`` if it is not in the catalog)."""
+    return regions()[name]
+
+
+# ------------------------------
+# Parallel Scoring
+# ------------------------------
+def score_partition(name):
+    """The derived features and every declared score of one menu file."""
+    return menu_store.load_features(name).join(load_engine(name).scores())
+
+
+def score_regions(partitions, max_workers=None):
+    """
+    Scores each region's menu in a process pool and merges the results into
+    one frame with a ``Region`` column. By default small catalogs (see
+    :data:`PARALLEL_MIN_BYTES`) are scored in-process.
+    """
+    partitions = list(partitions)
+    names = [part.menu for part in partitions]
+    if max_workers is None:
+        size = sum(menu_store.resolve_path(name).stat().st_size for name in names)
+        max_workers = os.cpu_count() if size >= PARALLEL_MIN_BYTES else 1
+    workers = min(max_workers, len(names))
+    if workers <= 1:
+        frames = [score_partition(name) for name in names]
+    else:
+        # Spawned workers: forking a threaded Streamlit server is unsafe.
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            frames = list(pool.map(score_partition, names))
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(
+        [frame.assign(Region=part.name) for part, frame in zip(partitions, frames)],
+        ignore_index=True,
+    )
+
+
+@menu_store.versioned_cache(maxsize=4)
+def _cached_all_scores(versions):
+    return score_regions(part for part, _ in versions)
+
+
+def catalog_version():
+    """Every region with the content hash of its menu file, for keying caches."""
+    return tuple((part, menu_store.menu_version(part.menu)) for part in regions().values())
+
+
+def load_all_scores():
+    """
+    Every region's features and scores in one frame, built once per catalog
+    version (read-only, like :func:`menu_store.load_menu`).
+    """
+    return _cached_all_scores(catalog_version()).copy(deep=False)
@@ -0,0 +1,275 @@
+"""
+Persisted item clusters for the Body page.
+
+The Body page groups items by their feeling-score profile with
+``StandardScaler`` + ``KMeans``. Fitting used to happen on every cold cache.
+Instead, the fitted scaler and cluster centers are saved as a small
+:class:`ClusterModel` under ``models/<menu>/<data hash>.npz``, so a worker
+only predicts (one nearest-center lookup) at startup. Only the current
+version's model is kept: older ones are deleted once it is saved.
+
+When the menu changes, the model of the version it replaced is updated
+instead of refitted. Rows are matched on their content hashes (``menu_store.row_hashes``)
+and scaled features: unchanged rows keep their center, removed or changed
+rows leave theirs, and new or changed rows join their nearest center,
+MiniBatchKMeans-style (each center is the running mean of the items
+assigned to it). The model records
+the min/max of the features behind the scores it was fitted on; if one of
+them has moved, every item's scores have shifted, so it is refitted (with
+the same ``k``) instead. Picking the number of clusters is an offline job
+that evaluates candidate ``k`` in parallel:
+
+    python -m happy.clusters [menu ...] --k-range 2 10 [--workers 4]
+"""
+import argparse
+import json
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+
+from happy import menu_store
+
+MODEL_DIR = menu_store.ROOT / "models"
+DEFAULT_K = 4
+RANDOM_STATE = 42
+
+
+@dataclass(frozen=True)
+class ClusterModel:
+    mean: np.ndarray      # StandardScaler mean_
+    scale: np.ndarray     # StandardScaler scale_
+    centers: np.ndarray   # Cluster centers, in scaled units
+    counts: np.ndarray    # Items assigned to each center
+    keys: np.ndarray      # Per item row, its content hash (made unique per copy, see _row_keys)
+    points: np.ndarray    # Per item row, its features in scaled units
+    labels: np.ndarray    # Per item row, the center it was assigned to
+    extremes: np.ndarray = None  # (min, max) of the score features it was fitted on
+
+    @property
+    def k(self):
+        return len(self.centers)
+
+    def transform(self, X):
+        return (np.asarray(X, dtype=float) - self.mean) / self.scale
+
+    def predict(self, X):
+        """Index of the nearest center for each row of ``X``."""
+        Xs = self.transform(X)
+        distances = ((Xs[:, None, :] - self.centers[None, :, :]) ** 2).sum(axis=2)
+        return distances.argmin(axis=1)
+
+    def update(self, hashes, X):
+        """
+        Returns the model for a new version of the menu, given its row content
+        ``hashes`` and features ``X``. Removed or changed rows are taken out
+        of their centers; new or changed rows each move their nearest center
+        by ``(x - center) / count``.
+        """
+        keys, Xs = _row_keys(hashes), self.transform(X)
+        match = menu_store.match_rows(self.keys, keys)
+        kept = match >= 0
+        kept[kept] = (self.points[match[kept]] == Xs[kept]).all(axis=1)  # Same row, same scores
+        if kept.all() and len(keys) == len(self.keys):
+            return self
+
+        # Remove what is gone from the running means (an emptied center stays put).
+        gone = np.ones(len(self.keys), dtype=bool)
+        gone[match[kept]] = False
+        sums = self.centers * self.counts[:, None]
+        np.subtract.at(sums, self.labels[gone], self.points[gone])
+        counts = self.counts - np.bincount(self.labels[gone], minlength=self.k)
+        centers = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], self.centers)
+
+        labels = np.empty(len(keys), dtype=np.int64)
+        labels[kept] = self.labels[match[kept]]
+        for i in np.flatnonzero(~kept):
+            c = ((centers - Xs[i]) ** 2).sum(axis=1).argmin()
+            counts[c] += 1
+            centers[c] += (Xs[i] - centers[c]) / counts[c]
+            labels[i] = c
+        return replace(self, centers=centers, counts=counts, keys=keys, points=Xs, labels=labels)
+
+
+def _row_keys(hashes):
+    """Row content hashes, with the i-th copy of a duplicated row mixed with i, so copies match one to one."""
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    order = np.argsort(hashes, kind="stable")
+    ordered = hashes[order]
+    starts = np.concatenate([[True], ordered[1:] != ordered[:-1]])
+    positions = np.arange(len(hashes))
+    copy = np.empty(len(hashes), dtype=np.uint64)
+    copy[order] = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+    return hashes + copy * np.uint64(0x9E3779B97F4A7C15)  # Wraps around
+
+
+def fit_model(hashes, X, k=DEFAULT_K):
+    """Fits the scaler and ``KMeans`` from scratch, for rows with content ``hashes``."""
+    from sklearn.cluster import KMeans
+    from sklearn.preprocessing import StandardScaler
+
+    scaler = StandardScaler().fit(X)
+    points = scaler.transform(X)
+    kmeans = KMeans(n_clusters=k, random_state=RANDOM_STATE).fit(points)
+    return ClusterModel(
+        mean=scaler.mean_, scale=scaler.scale_, centers=kmeans.cluster_centers_,
+        counts=np.bincount(kmeans.labels_, minlength=k).astype(float),
+        keys=_row_keys(hashes), points=points, labels=kmeans.labels_.astype(np.int64),
+    )
+
+
+# ------------------------------
+# Persistence
+# ------------------------------
+def model_path(name, version):
+    """Where the model for one version of a menu file is stored."""
+    return MODEL_DIR / Path(name).stem / f"{version}.npz"
+
+
+def save_model(model, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A temporary file of its own per writer, so concurrent saves never interleave.
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp", delete=False) as f:
+        try:
+            extra = {} if model.extremes is None else {"extremes": model.extremes}
+            np.savez(f, mean=model.mean, scale=model.scale, centers=model.centers, counts=model.counts,
+                     keys=model.keys, points=model.points, labels=model.labels, **extra)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    os.replace(f.name, path)  # Readers never see a partial file
+
+
+def read_model(path):
+    with np.load(path, allow_pickle=False) as data:
+        return ClusterModel(
+            mean=data["mean"], scale=data["scale"], centers=data["centers"], counts=data["counts"],
+            keys=data["keys"], points=data["points"], labels=data["labels"],
+            extremes=data["extremes"] if "extremes" in data else None,
+        )
+
+
+def _read_model_or_none(path):
+    """:func:`read_model`, or None when the file is gone, corrupt or from an older format (refit)."""
+    try:
+        return read_model(path)
+    except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def _base_model_path(name, previous):
+    """
+    The saved model to update for a new version of a menu file: the one for
+    the version it replaced, else the menu's only saved model (the version
+    served last, after a restart), else None.
+    """
+    if previous is not None and model_path(name, previous).exists():
+        return model_path(name, previous)
+    paths = list((MODEL_DIR / Path(name).stem).glob("*.npz"))
+    return paths[0] if len(paths) == 1 else None
+
+
+def prune_models(name, version):
+    """Deletes the saved models of a menu file other than the one for ``version``."""
+    keep = model_path(name, version)
+    for path in (MODEL_DIR / Path(name).stem).glob("*.npz"):
+        if path != keep:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Pruned by another worker
+
+
+def load_model(name, version, hashes, X, extremes=None, previous=None):
+    """
+    The cluster model for ``version`` of a menu file, whose rows have content
+    ``hashes`` and features ``X``: read from disk when saved, else the model
+    of the ``previous`` version (see :func:`_base_model_path`) updated with
+    the changed rows (if the score ``extremes`` it was fitted on still hold),
+    else a fresh fit. New models are saved, replacing the older ones (when
+    the model directory is writable).
+    """
+    path = model_path(name, version)
+    model = _read_model_or_none(path)
+    if model is not None:
+        return model
+
+    base = _base_model_path(name, previous)
+    model = _read_model_or_none(base) if base is not None else None
+    if model is not None and (model.extremes is None or extremes is None
+                              or np.array_equal(model.extremes, extremes, equal_nan=True)):
+        model = model.update(hashes, X)
+    else:
+        model = fit_model(hashes, X, model.k if model is not None else DEFAULT_K)
+    model = replace(model, extremes=extremes)
+    try:
+        save_model(model, path)
+        prune_models(name, version)
+    except OSError:
+        pass  # Read-only deployment: keep the model in memory only
+    return model
+
+
+# ------------------------------
+# Offline k Selection
+# ------------------------------
+def evaluate_k(X, k):
+    """``(k, inertia, silhouette)`` of a ``KMeans`` fit on scaled ``X``."""
+    from sklearn.cluster import KMeans
+    from sklearn.metrics import silhouette_score
+
+    kmeans = KMeans(n_clusters=k, random_state=RANDOM_STATE).fit(X)
+    return k, kmeans.inertia_, silhouette_score(X, kmeans.labels_)
+
+
+def select_k(X, candidates, max_workers=None):
+    """Evaluates each candidate ``k`` in a process pool; returns the results and the best ``k``."""
+    from sklearn.preprocessing import StandardScaler
+
+    Xs = StandardScaler().fit_transform(X)
+    candidates = [k for k in candidates if 2 <= k < len(Xs)]
+    with ProcessPoolExecutor(max_workers) as pool:
+        results = list(pool.map(evaluate_k, [Xs] * len(candidates), candidates))
+    best = max(results, key=lambda r: r[2])[0] if results else DEFAULT_K
+    return results, best
+
+
+def main(argv=None):
+    from happy.body import body_features
+    from happy.scoring import BODY_SCORES, load_engine
+
+    parser = argparse.ArgumentParser(description="Pick k and save the Body page cluster models.")
+    parser.add_argument("menus", nargs="*", help="menu CSV files (default: every region's Body menu)")
+    parser.add_argument("--k-range", nargs=2, type=int, default=[2, 10], metavar=("MIN", "MAX"))
+    parser.add_argument("--k", type=int, help="fit this k instead of selecting one")
+    parser.add_argument("--workers", type=int, default=None, help="processes evaluating k")
+    args = parser.parse_args(argv)
+
+    if not args.menus:
+        from happy import catalog
+        args.menus = [part.menu_new for part in catalog.regions().values()]
+
+    for name in args.menus:
+        hashes, X = body_features(name)
+        k = args.k
+        if k is None:
+            results, k = select_k(X, range(args.k_range[0], args.k_range[1] + 1), args.workers)
+            print(json.dumps({"menu": name, "candidates": [
+                {"k": c, "inertia": round(float(inertia), 3), "silhouette": round(float(s), 4)}
+                for c, inertia, s in results
+            ]}))
+        version = menu_store.menu_version(name)
+        path = model_path(name, version)
+        save_model(replace(fit_model(hashes, X, k), extremes=load_engine(name).extremes(BODY_SCORES)), path)
+        prune_models(name, version)
+        print(f"{name}: k={k} -> {path}")
+
+
+if __name__ == "__main__":
+    main()
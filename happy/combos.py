@@ -0,0 +1,338 @@
+"""
+Meal combinations: one item per slot (a ``Menu Category``, e.g. two from the
+Regular Menu and one from Beverages) maximizing a score under nutrient caps.
+
+The combo score is the sum of its items' scores. Caps bound the combo's
+summed nutrients (:data:`CAPS`), and a condition from ``disorders.py``
+restricts every slot to the items its recommender picks from.
+
+The search is a branch-and-bound over the slots:
+
+- items that break a cap even next to the cheapest items of the other slots
+  are dropped;
+- each cap gets a price (Lagrangian multipliers, by subgradient steps), and
+  a slot's items are searched by their score less the price of their
+  nutrients; the prices plus these reduced scores bound what any branch can
+  still reach;
+- a first dive finds a combo to beat, and items whose bound can't beat it
+  are dropped; of the rest, items another item beats on score without
+  costing more on any cap are dropped too (a slot filled ``k`` times keeps
+  those beaten by fewer than ``k`` items);
+- slots are searched smallest first, and a branch stops as soon as its
+  bound can't beat the best combo so far (the rest of its slot, sorted by
+  reduced score, can't either);
+- the last two levels (the largest slot last) are solved at once, comparing
+  every pair of items in vectorized blocks.
+
+A slot filled more than once picks distinct items. Combos within :data:`GAP`
+of the best count as best. A search stops after about :data:`MAX_WORK` item
+x cap comparisons (half a second or so) and returns the best combo found so
+far, marked inexact: with many caps, tens of thousands of items per slot
+and scores spread evenly over them, proving the best can take far longer
+than finding it.
+"""
+import numpy as np
+import pandas as pd
+
+from happy import disorders, ingredients, menu_store, mood, results, timing
+from happy.scoring import load_engine
+from happy.swaps import LOWER_IS_BETTER, OBJECTIVES as SWAP_OBJECTIVES
+
+# ---- Objectives (score column -> label) ----
+OBJECTIVES = {"Mood Support Score": "💜 Mood", **SWAP_OBJECTIVES}
+
+# ---- Capped Nutrients (column -> short name, as in API parameters) ----
+CAPS = {
+    "Energy (kCal)": "kcal",
+    "Total carbohydrate (g)": "carbs",
+    "Total Sugars (g)": "sugars",
+    "Added Sugars (g)": "added_sugars",
+    "Total fat (g)": "fat",
+    "Sat Fat (g)": "sat_fat",
+    "Sodium (mg)": "sodium",
+}
+DEFAULT_CAPS = {"Energy (kCal)": 800.0, "Added Sugars (g)": 25.0, "Sodium (mg)": 1500.0}
+
+MAX_WORK = 100_000_000  # Item x cap comparisons before settling for the best combo so far
+NODE_WORK = 16_384      # Comparisons a branch's own overhead counts as
+PAIR_CELLS = 2**20      # Item pairs compared at once on the last two levels
+GAP = 1e-3              # Combos within this of the best count as best (scores show 3 decimals)
+
+
+# ------------------------------
+# Search
+# ------------------------------
+def _frontier(goodness, costs, copies=1, chunk=256):
+    """
+    Positions of the items beaten (higher goodness, no higher cost) by fewer
+    than ``copies`` others, best first.
+    """
+    order = np.lexsort([*costs.T[::-1], -goodness])
+    costs = costs[order]
+    kept = np.zeros(len(order), dtype=bool)
+    for lo in range(0, len(order), chunk):
+        # Earlier kept items, then earlier items of the block: an item beaten
+        # by a dropped item is beaten by the ``copies`` items that beat that one.
+        block = costs[lo:lo + chunk]
+        earlier = np.concatenate([costs[:lo][kept[:lo]], block])
+        beaten = np.ones((len(block), len(earlier)), dtype=bool)
+        for k in range(costs.shape[1]):
+            beaten &= earlier[:, k][None, :] <= block[:, k][:, None]
+        # Block items only count as beating the items after them.
+        beaten[:, -len(block):] &= np.tri(len(block), k=-1, dtype=bool)
+        kept[lo:lo + chunk] = beaten.sum(axis=1) < copies
+    return order[kept]
+
+
+def _multipliers(levels, caps, steps=100):
+    """
+    Nonnegative cost prices ``lam`` (per unit of each cap) making the
+    Lagrangian bound ``lam @ caps + sum(best goodness - lam @ costs)`` low,
+    by projected subgradient steps. ``levels`` are ``(goodness, costs)`` pairs.
+    """
+    if not len(caps):
+        return np.zeros(0)
+    scale = np.where(caps > 0, caps, 1.0)
+    spread = max(np.ptp(g) for g, _ in levels) or 1.0
+    lam = np.zeros(len(caps))
+    best_lam, best_bound = lam, np.inf
+    for step in range(steps):
+        bound, used = lam @ (caps / scale), np.zeros(len(caps))
+        for g, c in levels:
+            i = np.argmax(g - (c / scale) @ lam)
+            bound += g[i] - (c[i] / scale) @ lam
+            used += c[i] / scale
+        if bound < best_bound:
+            best_lam, best_bound = lam, bound
+        lam = np.maximum(0.0, lam - spread / (1 + step) * (caps / scale - used))
+    return best_lam / scale
+
+
+def _plan(groups, candidates, lam):
+    """
+    Search levels, one per pick: ``(group, positions, goodness, costs,
+    reduced goodness, repeats the previous level)``. Groups go smallest
+    first, so the largest is the vectorized last level, and items best first
+    by goodness less the Lagrangian price of their costs.
+    """
+    plan = []
+    for group in sorted(range(len(groups)), key=lambda group: len(candidates[group])):
+        goodness, costs, copies = groups[group]
+        reduced = goodness[candidates[group]] - costs[candidates[group]] @ lam
+        order = np.argsort(-reduced, kind="stable")
+        keep = candidates[group][order]
+        plan += [(group, keep, goodness[keep], costs[keep], reduced[order], copy > 0) for copy in range(copies)]
+    return plan
+
+
+def _branch_and_bound(plan, caps, lam, max_work, floor=-np.inf, gap=0.0):
+    """
+    The best ``(score, picks per level, work done)`` over ``plan`` above
+    ``floor``; picks is None when nothing beats it. Branches that can't beat
+    the best so far by more than ``gap`` are pruned. The first branch is
+    always searched: with ``max_work=0`` this is a single dive.
+    """
+    # Bounds over the levels after each level. The n-th copy of a group
+    # picks at best its n-th item (by reduced goodness).
+    depth = len(plan)
+    rest_best, rest_reduced = np.zeros(depth), np.zeros(depth)
+    rest_min = np.zeros((depth, len(caps)))
+    for d in range(depth - 2, -1, -1):
+        group, _, g, c, reduced, _ = plan[d + 1]
+        copy = sum(level[0] == group for level in plan[:d + 1])
+        rest_best[d] = rest_best[d + 1] + g.max()
+        rest_reduced[d] = rest_reduced[d + 1] + reduced[copy]
+        rest_min[d] = rest_min[d + 1] + c.min(axis=0)
+
+    best = {"score": floor, "picks": None}
+    picks = [0] * depth
+    work = 0
+
+    def visit(d, score, used):
+        nonlocal work
+        _, _, g, c, reduced, repeat = plan[d]
+        start = picks[d - 1] + 1 if repeat else 0
+        work += NODE_WORK + (len(c) - start) * max(1, len(caps))
+        room = caps - used - rest_min[d]
+        fits = np.flatnonzero((c[start:] <= room).all(axis=1)) + start
+        if d == depth - 1:
+            if len(fits):
+                i = fits[np.argmax(g[fits])]
+                if score + g[i] > best["score"]:
+                    picks[d] = i
+                    best["score"], best["picks"] = score + g[i], list(picks)
+            return
+        priced_room = (caps - used) @ lam + rest_reduced[d]
+        if d == depth - 2:
+            pairs(d, score, used, fits[score + g[fits] + rest_best[d] > best["score"] + gap], priced_room)
+            return
+        for i in fits:
+            if score + reduced[i] + priced_room <= best["score"] + gap:
+                break
+            if score + g[i] + rest_best[d] <= best["score"] + gap:
+                continue
+            picks[d] = i
+            visit(d + 1, score + g[i], used + c[i])
+            if work >= max_work:
+                break
+
+    def pairs(d, score, used, rows, priced_room):
+        # The last two levels at once: every row item against every last item.
+        nonlocal work
+        _, _, g, c, reduced, _ = plan[d]
+        _, _, g2, c2, _, repeat = plan[d + 1]
+        slack = caps - used - c2  # Room each last item leaves for the row item
+        for lo in range(0, len(rows), max(1, PAIR_CELLS // len(g2))):
+            block = rows[lo:lo + max(1, PAIR_CELLS // len(g2))]
+            block = block[score + reduced[block] + priced_room > best["score"] + gap]
+            if not len(block):
+                break
+            # Only last items that could beat the best with the block's best item.
+            cols = np.flatnonzero(score + g[block].max() + g2 > best["score"] + gap)
+            ok = np.ones((len(block), len(cols)), dtype=bool)
+            for k in range(len(caps)):
+                ok &= c[block, k][:, None] <= slack[cols, k][None, :]
+            if repeat:
+                ok &= cols[None, :] > block[:, None]
+            work += ok.size * max(1, len(caps))
+            totals = np.where(ok, g[block][:, None] + g2[cols][None, :], -np.inf)
+            if totals.size:
+                r, j = np.unravel_index(np.argmax(totals), totals.shape)
+                if score + totals[r, j] > best["score"]:
+                    picks[d], picks[d + 1] = block[r], cols[j]
+                    best["score"], best["picks"] = score + totals[r, j], list(picks)
+            if work >= max_work:
+                break
+
+    if depth:
+        visit(0, 0.0, np.zeros(len(caps)))
+    return best["score"], best["picks"], work
+
+
+def _positions(plan, picks, groups):
+    positions = [[] for _ in groups]
+    for (group, keep, *_), i in zip(plan, picks):
+        positions[group].append(int(keep[i]))
+    return positions
+
+
+def search(groups, caps, max_work=MAX_WORK, gap=GAP):
+    """
+    Picks items maximizing their summed goodness with summed costs within
+    ``caps``. Each group is ``(goodness, costs, copies)``: a slot's candidates
+    (costs are items x caps) and how many distinct items to pick from them.
+    Returns ``(positions per group or None, exact)``; exact combos are within
+    ``gap`` of the best.
+    """
+    caps = np.asarray(caps, dtype=float)
+    if any(len(goodness) < copies for goodness, _, copies in groups):
+        return None, True
+
+    # Items that break a cap even with the cheapest items of every other
+    # slot never fit.
+    cheapest = [costs.min(axis=0) if len(costs) else np.zeros(len(caps)) for _, costs, _ in groups]
+    total = sum(copies * low for (_, _, copies), low in zip(groups, cheapest))
+    candidates = [np.flatnonzero((costs + total - low <= caps).all(axis=1))
+                  for (_, costs, _), low in zip(groups, cheapest)]
+    if any(len(fits) < copies for fits, (_, _, copies) in zip(candidates, groups)):
+        return None, True
+    lam = _multipliers([(goodness[fits], costs[fits]) for fits, (goodness, costs, _) in zip(candidates, groups)], caps)
+
+    # A first dive finds a combo to beat. Items whose Lagrangian bound can't
+    # beat it by more than ``gap`` are dropped; of the rest, only each
+    # group's frontier can be best.
+    plan = _plan(groups, candidates, lam)
+    incumbent, picks, _ = _branch_and_bound(plan, caps, lam, 0)
+    positions = None if picks is None else _positions(plan, picks, groups)
+
+    reduced = [goodness[fits] - costs[fits] @ lam for fits, (goodness, costs, _) in zip(candidates, groups)]
+    tops = [np.sort(r)[::-1][:copies] for r, (_, _, copies) in zip(reduced, groups)]
+    ceiling = caps @ lam + sum(top.sum() for top in tops)
+    for group, (goodness, costs, copies) in enumerate(groups):
+        bound = ceiling - tops[group][-1] + reduced[group]
+        fits = candidates[group][bound > incumbent + gap]
+        candidates[group] = fits[_frontier(goodness[fits], costs[fits], copies)]
+    if any(len(fits) < copies for fits, (_, _, copies) in zip(candidates, groups)):
+        return positions, True
+
+    plan = _plan(groups, candidates, lam)
+    _, picks, work = _branch_and_bound(plan, caps, lam, max_work, incumbent, gap)
+    if picks is not None:
+        positions = _positions(plan, picks, groups)
+    return positions, work < max_work
+
+
+# ------------------------------
+# Menu Combos
+# ------------------------------
+def combo_table(df, engine, mood_scores):
+    """Per item: name, category, capped nutrients, condition flags and every objective's score."""
+    flags = [col for col in df.columns if col.startswith("contains_")]
+    table = df[["Menu Items", "Menu Category", *CAPS, *flags]].reset_index(drop=True)
+    scores = engine.scores().astype(float).reset_index(drop=True)
+    return table.join(scores).assign(**{"Mood Support Score": mood_scores["normal"].to_numpy()})
+
+
+@menu_store.versioned_cache(maxsize=8)
+def _cached_table(name, version):
+    return combo_table(disorders.load_disorder_data(name), load_engine(name), mood.load_mood_scores(name))
+
+
+def load_combo_table(name=menu_store.MENU_FILE):
+    """The combo table for a menu file, built once per data version."""
+    return _cached_table(name, (menu_store.menu_version(name), ingredients.table_version(name)))
+
+
+def best_combo(table, slots, objective, caps=None, condition=None, max_work=MAX_WORK):
+    """
+    The best combo of ``table`` (see :func:`combo_table`) with one item per
+    entry of ``slots`` (``Menu Category`` values), on ``objective`` (one of
+    :data:`OBJECTIVES`) with ``caps`` ({nutrient column: maximum}) and an
+    optional condition. Returns ``(items, exact)``: one row per slot, or an
+    empty frame when nothing fits.
+    """
+    caps = {col: cap for col, cap in (caps or {}).items() if cap is not None}
+    values = table[objective].to_numpy(dtype=float)
+    goodness = -values if objective in LOWER_IS_BETTER else values
+
+    # Items without a score or a capped nutrient can't be ranked or checked.
+    usable = ~np.isnan(goodness)
+    costs = table[list(caps)].to_numpy(dtype=float)
+    usable &= ~np.isnan(costs).any(axis=1)
+    if condition:
+        usable &= disorders.condition_mask(table, condition).to_numpy(dtype=bool)
+
+    copies = pd.Series(slots, dtype=object).value_counts(sort=False)
+    categories = table["Menu Category"].to_numpy()
+    candidates = {category: np.flatnonzero(usable & (categories == category)) for category in copies.index}
+
+    with timing.stage("rank"):
+        positions, exact = search(
+            [(goodness[candidates[category]], costs[candidates[category]], count)
+             for category, count in copies.items()],
+            list(caps.values()), max_work,
+        )
+    columns = ["Menu Items", "Menu Category", *caps, objective]
+    if positions is None:
+        return table.iloc[:0][columns], exact
+    # Grouped by category, in order of first appearance in ``slots``.
+    rows = [candidates[category][pos] for category, group in zip(copies.index, positions) for pos in group]
+    combo = table.iloc[rows][columns].reset_index(drop=True)
+    combo[objective] = combo[objective].round(3)
+    return combo, exact
+
+
+def cached_combo(name, slots, objective, caps=None, condition=None):
+    """
+    :func:`best_combo` for a menu file, from the shared result cache. Keyed
+    on the menu and ingredients table versions.
+    """
+    caps = tuple((col, float(caps[col])) for col in CAPS if (caps or {}).get(col) is not None)
+    version = (menu_store.menu_version(name), ingredients.table_version(name))
+    def compute():
+        with timing.page("combos"):
+            with timing.stage("load"):
+                table = load_combo_table(name)
+            return best_combo(table, list(slots), objective, dict(caps), condition)
+
+    return results.remember("combos", (name, tuple(slots), objective, caps, condition), version, compute)
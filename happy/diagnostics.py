@@ -0,0 +1,61 @@
+"""
+Hidden diagnostics view: warm-up progress, per-stage latencies and result
+cache counters.
+
+Not listed in the page navigation; the landing page renders it instead of
+itself when opened as ``/?diagnostics``. The numbers are those of the
+Streamlit server process serving the request.
+"""
+import pandas as pd
+import streamlit as st
+
+from happy import results, timing, warmup
+
+METRICS_FILE = "happy_metrics.prom"
+
+
+def render():
+    st.title("🩺 Diagnostics")
+
+    # ---- Warm-up ----
+    status = warmup.status()
+    st.subheader("Warm-up")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("State", status["state"])
+    col2.metric("Regions", f"{status['done']} / {status['regions']}")
+    col3.metric("Took", "-" if status["seconds"] is None else f"{status['seconds']:.1f} s")
+    if status["error"]:
+        st.error(status["error"])
+
+    # ---- Stage Latencies ----
+    st.subheader("Stage latencies (ms)")
+    rows = timing.summary()
+    if rows:
+        st.dataframe(pd.DataFrame(rows).set_index(["page", "stage"]).round(2), use_container_width=True)
+    else:
+        st.info("No samples yet: use the pages first.")
+
+    # ---- Result Cache ----
+    st.subheader("Result cache")
+    stats = results.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hit rate", f"{stats['hit_rate']:.0%}")
+    col2.metric("Entries", f"{stats['entries']} / {stats['max_entries']}")
+    col3.metric("Size", f"{stats['bytes'] / 2**20:.1f} / {stats['max_bytes'] / 2**20:.0f} MB")
+    col4.metric("Evictions", stats["evictions"] + stats["expirations"])
+    st.caption(f"{stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evicted, "
+               f"{stats['expirations']} expired (TTL {stats['ttl']} s)")
+
+    # ---- Prometheus Export ----
+    st.subheader("Prometheus export")
+    text = timing.prometheus_text()
+    col1, col2, col3 = st.columns(3)
+    col1.download_button("Download metrics", text, file_name=METRICS_FILE, mime="text/plain")
+    if col2.button(f"Export to {METRICS_FILE} every 15 s"):
+        timing.start_exporter(METRICS_FILE)
+        st.success(f"Writing {METRICS_FILE}")
+    if col3.button("Reset latencies"):
+        timing.reset()
+        st.rerun()
+    with st.expander("Metrics text"):
+        st.code(text, language="text")
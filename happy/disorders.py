@@ -0,0 +1,238 @@
+"""
+Disorders page recommendations for one or several health conditions.
+
+Exclusions read the precomputed ``contains_<group>`` columns from
+``ingredients.py``, and ``Diabetes_Score``/``PCOS_Score`` come from the
+shared scoring engine, normalized over the candidate items only, as fitting
+MinMaxScaler on the filtered frame did.
+
+For several conditions, :class:`ConditionTable` holds every condition's
+eligibility (one bit per condition per item) and ranking score (scaled to
+0-1 over its eligible items, best 1) once per data version. Any combination
+is then one bit test and one blend of the fixed score matrix, however many
+conditions are selected.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from happy import ingredients, menu_store, results, timing
+from happy.lexicons import ALLERGEN_MAP
+from happy.ranking import top_k, top_k_rows
+from happy.scoring import load_engine
+
+CONDITIONS = ["Diabetes", "Lactose Intolerance", "Gluten Intolerance", "Nut Allergy", "PCOS/PCOD"]
+
+# ---- Ranking per Condition (column, lower is better), as in its recommender ----
+CONDITION_RANKING = {
+    "Diabetes": ("Diabetes_Score", True),
+    "Lactose Intolerance": ("Energy (kCal)", True),
+    "Gluten Intolerance": ("Energy (kCal)", True),
+    "Nut Allergy": ("Energy (kCal)", True),
+    "PCOS/PCOD": ("PCOS_Score", False),
+}
+BLEND_COLUMNS = ["Menu Items", "Menu Category", "Energy (kCal)", "Protein (g)", "Total Sugars (g)",
+                 "Total carbohydrate (g)"]
+
+
+def load_disorder_data(name=menu_store.MENU_FILE):
+    """The menu with its ``contains_<group>`` allergen columns."""
+    return menu_store.load_menu(name).join(ingredients.allergen_columns(name))
+
+
+# ------------------------------
+# Scoring Functions
+# ------------------------------
+def compute_diabetes_score(df, mask, engine):
+    with timing.stage("score"):
+        return df.assign(Diabetes_Score=engine.score("Diabetes_Score", mask))
+
+
+def compute_pcos_score(df, mask, engine):
+    with timing.stage("score"):
+        return df.assign(PCOS_Score=engine.score("PCOS_Score", mask))
+
+
+# ------------------------------
+# Filtering Functions
+# ------------------------------
+def filter_lactose(df):
+    return df[~df["contains_dairy"]]
+
+
+def filter_gluten(df):
+    return df[~df["contains_gluten"]]
+
+
+def filter_allergen(df, allergen):
+    return df[~df[f"contains_{allergen}"]]
+
+
+def diabetes_mask(df):
+    """Items within the diabetes sugar and carbohydrate limits."""
+    return (df["Total Sugars (g)"] <= 5) & (df["Total carbohydrate (g)"] <= 20)
+
+
+def pcos_mask(df):
+    """Items without PCOS trigger ingredients."""
+    return ~df["contains_pcos_avoid"]
+
+
+def condition_mask(df, condition):
+    """The items each recommender for one of :data:`CONDITIONS` picks from."""
+    if condition == "Diabetes":
+        return diabetes_mask(df)
+    elif condition == "PCOS/PCOD":
+        return pcos_mask(df)
+    elif condition == "Lactose Intolerance":
+        return ~df["contains_dairy"]
+    elif condition == "Gluten Intolerance":
+        return ~df["contains_gluten"]
+    elif condition == "Nut Allergy":
+        return ~df["contains_nuts"]
+    raise ValueError(f"Unknown condition: {condition!r}")
+
+
+# ------------------------------
+# Recommendation Functions
+# ------------------------------
+def recommend_for_diabetes(df, engine):
+    mask = diabetes_mask(df)
+    scored_df = compute_diabetes_score(df, mask, engine)
+    ranked = top_k_rows(scored_df, "Diabetes_Score", 10, mask=mask, ascending=True)
+    return ranked[["Menu Items", "Menu Category", "Total Sugars (g)", "Total carbohydrate (g)", "Protein (g)", "Diabetes_Score"]]
+
+
+def recommend_for_pcos(df, engine):
+    mask = pcos_mask(df)
+    scored_df = compute_pcos_score(df, mask, engine)
+    ranked = top_k_rows(scored_df, "PCOS_Score", 10, mask=mask)
+    return ranked[["Menu Items", "Menu Category", "Protein (g)", "Total Sugars (g)", "Total carbohydrate (g)", "PCOS_Score"]]
+
+
+def recommend_for_lactose_intolerance(df):
+    filtered = filter_lactose(df)
+    ranked = top_k_rows(filtered, "Energy (kCal)", 10, ascending=True)
+    return ranked[["Menu Items", "Menu Category", "Energy (kCal)"]]
+
+
+def recommend_for_gluten_intolerance(df):
+    filtered = filter_gluten(df)
+    ranked = top_k_rows(filtered, "Energy (kCal)", 10, ascending=True)
+    return ranked[["Menu Items", "Menu Category", "Energy (kCal)"]]
+
+
+def recommend_for_allergy(df, allergen="nuts"):
+    allergen = allergen.lower()
+    filtered = filter_allergen(df, allergen) if allergen in ALLERGEN_MAP else df
+    ranked = top_k_rows(filtered, "Energy (kCal)", 10, ascending=True)
+    return ranked[["Menu Items", "Menu Category", "Energy (kCal)"]]
+
+
+def recommend_for_condition(df, condition, engine):
+    """
+    Dispatches to the recommender for one of :data:`CONDITIONS`. ``engine``
+    is the scoring engine of the menu ``df`` was loaded from.
+    """
+    if condition == "Diabetes":
+        return recommend_for_diabetes(df, engine)
+    elif condition == "PCOS/PCOD":
+        return recommend_for_pcos(df, engine)
+    elif condition == "Lactose Intolerance":
+        return recommend_for_lactose_intolerance(df)
+    elif condition == "Gluten Intolerance":
+        return recommend_for_gluten_intolerance(df)
+    elif condition == "Nut Allergy":
+        return recommend_for_allergy(df, allergen="nuts")
+    raise ValueError(f"Unknown condition: {condition!r}")
+
+
+def cached_recommendations(name, condition):
+    """
+    :func:`recommend_for_condition` for a menu file, from the shared result
+    cache. Keyed on the menu and ingredients table versions.
+    """
+    version = (menu_store.menu_version(name), ingredients.table_version(name))
+    def compute():
+        with timing.page("disorders"):
+            with timing.stage("load"):
+                df, engine = load_disorder_data(name), load_engine(name)
+            return recommend_for_condition(df, condition, engine)
+
+    return results.remember("disorders", (name, condition), version, compute)
+
+
+# ------------------------------
+# Several Conditions
+# ------------------------------
+@dataclass(frozen=True)
+class ConditionTable:
+    items: pd.DataFrame   # BLEND_COLUMNS, in menu order
+    excluded: np.ndarray  # Per item, bit i set when CONDITIONS[i] rules it out (or can't rank it)
+    goodness: np.ndarray  # Items x CONDITIONS, 0-1 over each condition's eligible items (0 if excluded)
+
+    def recommend(self, weights, top_n=10):
+        """
+        The ``top_n`` items allowed under every condition of ``weights``
+        ({condition: weight}), by their weighted mean goodness. All-zero
+        weights count as equal weights.
+        """
+        selected = sum(1 << i for i, condition in enumerate(CONDITIONS) if condition in weights)
+        w = np.array([float(weights.get(condition, 0.0)) for condition in CONDITIONS])
+        if not w.sum() > 0:
+            w = np.array([1.0 if condition in weights else 0.0 for condition in CONDITIONS])
+        blended = self.goodness @ (w / w.sum() if w.sum() > 0 else w)
+        ranked = top_k(blended, top_n, mask=(self.excluded & selected) == 0)
+        out = self.items.iloc[ranked].reset_index(drop=True)
+        out["Blended_Score"] = blended[ranked].round(3)
+        return out
+
+
+def condition_table(df, engine):
+    """The :class:`ConditionTable` of a disorder data frame and its scoring engine."""
+    excluded = np.zeros(len(df), dtype=np.int64)
+    goodness = np.zeros((len(df), len(CONDITIONS)))
+    for i, condition in enumerate(CONDITIONS):
+        mask = condition_mask(df, condition).to_numpy(dtype=bool)
+        column, lower_is_better = CONDITION_RANKING[condition]
+        if column in engine.specs:
+            values = engine.score(column, mask).astype(float)
+        else:
+            values = df[column].to_numpy(dtype=float)
+        eligible = mask & ~np.isnan(values)
+        excluded |= np.where(eligible, 0, 1 << i)
+        if eligible.any():
+            low, high = values[eligible].min(), values[eligible].max()
+            scaled = (values - low) / (high - low) if high > low else np.ones(len(df))
+            goodness[:, i] = np.where(eligible, 1.0 - scaled if lower_is_better else scaled, 0.0)
+    return ConditionTable(df[BLEND_COLUMNS].reset_index(drop=True), excluded, goodness)
+
+
+@menu_store.versioned_cache(maxsize=8)
+def _cached_condition_table(name, version):
+    df, engine = load_disorder_data(name), load_engine(name)
+    with timing.stage("score"):
+        return condition_table(df, engine)
+
+
+def load_condition_table(name=menu_store.MENU_FILE):
+    """The condition table for a menu file, built once per data version."""
+    return _cached_condition_table(name, (menu_store.menu_version(name), ingredients.table_version(name)))
+
+
+def cached_blended_recommendations(name, weights, top_n=10):
+    """
+    :meth:`ConditionTable.recommend` for a menu file, from the shared result
+    cache. Keyed on the menu and ingredients table versions.
+    """
+    weights = tuple((condition, float(weights[condition])) for condition in CONDITIONS if condition in weights)
+    version = (menu_store.menu_version(name), ingredients.table_version(name))
+    def compute():
+        with timing.page("disorders"):
+            with timing.stage("load"):
+                table = load_condition_table(name)
+            with timing.stage("rank"):
+                return table.recommend(dict(weights), top_n)
+
+    return results.remember("disorders", ("blend", name, weights, top_n), version, compute)
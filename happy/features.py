@@ -0,0 +1,231 @@
+"""
+Derived menu columns shared by the pages.
+
+These used to be computed inline by ``soul.py`` (veg/processed flags, fat,
+energy and carb ratios), ``texture.py`` (Texture/Feeling) and ``mood.py``
+(Veg/Non-Veg category) on every rerun, each with its own keyword loop. They
+depend only on the menu file, so they are computed once per data version by
+:func:`add_derived_columns`, either from the CSV or ahead of time into a
+snapshot (see ``snapshot.py``). All name-based flags come from a single scan
+of the shared keyword matcher (see ``matcher.py``), and serving sizes from
+one vectorized parse of the distinct sizes (:func:`parse_serving_sizes`),
+which also gives every page per-100g nutrient columns.
+
+When a menu file changes, :func:`update_derived_columns` carries unchanged
+rows over from the previous version and only classifies the new ones.
+"""
+import numpy as np
+import pandas as pd
+
+from happy.lexicons import TEXTURE_LEXICON, TEXTURE_FEELINGS
+from happy.matcher import classify_items
+
+# ---- Nutrient Columns with a per-100g View ----
+PER_100G_COLUMNS = {
+    "Energy (kCal)": "energy_per_100g",
+    "Protein (g)": "protein_per_100g",
+    "Total fat (g)": "fat_per_100g",
+    "Sat Fat (g)": "sat_fat_per_100g",
+    "Trans fat (g)": "trans_fat_per_100g",
+    "Cholesterols (mg)": "cholesterol_per_100g",
+    "Total carbohydrate (g)": "carbs_per_100g",
+    "Total Sugars (g)": "sugars_per_100g",
+    "Added Sugars (g)": "added_sugars_per_100g",
+    "Sodium (mg)": "sodium_per_100g",
+}
+
+DERIVED_COLUMNS = [
+    "is_veg", "is_processed", "healthy_fat_ratio", "serve_weight",
+    "energy_density", "complex_carb_ratio", "Texture", "Feeling", "Category",
+    "serve_unit", "serve_pieces", *PER_100G_COLUMNS.values(),
+]
+
+# ---- Serving Size Units ----
+# Grams per unit. Volumes count at the density of water, so "330 ml" weighs
+# 330 g as it always has.
+MASS_UNITS = {
+    "g": 1.0, "gm": 1.0, "gms": 1.0, "gram": 1.0, "grams": 1.0, "kg": 1000.0, "mg": 0.001, "oz": 28.35,
+}
+VOLUME_UNITS = {
+    "ml": 1.0, "l": 1000.0, "ltr": 1000.0, "litre": 1000.0, "liter": 1000.0, "floz": 29.57,
+}
+PIECE_UNITS = {"pc", "pcs", "piece", "pieces", "no", "nos", "nuggets", "slice", "slices"}
+
+# An optional "<n> x" multiplier, an amount and a unit: "2 x 60 g", "330ml", "6 pcs".
+_SIZE_PATTERN = r"(?:(?P<times>\d+)\s*[x×*]\s*)?(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>fl\.?\s*oz|[a-z]+)"
+_NUMBER_ONLY = r"^(\d+(?:\.\d+)?)$"
+
+
+# ------------------------------
+# Name-Based Classifiers
+# ------------------------------
+def classify_names(names):
+    """
+    Classifies item names with one scan of the shared keyword matcher.
+
+    Returns a frame with ``is_veg``/``is_processed`` (soul), ``Texture`` (the
+    texture with the most keyword hits, first in lexicon order on ties) and
+    ``Category`` (mood's Veg/Non-Veg), aligned with ``names``.
+    """
+    hits = classify_items(names)
+
+    texture_counts = hits[[f"texture:{t}" for t in TEXTURE_LEXICON]].to_numpy()
+    textures = np.array(list(TEXTURE_LEXICON) + ["Unknown ❓"], dtype=object)
+    best = np.where(texture_counts.max(axis=1) > 0, texture_counts.argmax(axis=1), len(TEXTURE_LEXICON))
+
+    return pd.DataFrame({
+        "is_veg": (hits["non_veg"] == 0).astype(np.int64),
+        "is_processed": (hits["processed"] > 0).astype(np.int64),
+        "Texture": textures[best],
+        "Category": np.where(hits["mood_non_veg"] > 0, "Non-Veg", "Veg"),
+    }, index=hits.index)
+
+
+# ------------------------------
+# Nutrient Ratios
+# ------------------------------
+def healthy_fat_ratio(df):
+    """Share of total fat that is neither saturated nor trans fat."""
+    return np.where(
+        df['Total fat (g)'] > 0,
+        (df['Total fat (g)'] - df['Sat Fat (g)'] - df['Trans fat (g)']) / df['Total fat (g)'],
+        1
+    )
+
+
+# ------------------------------
+# Serving Sizes
+# ------------------------------
+def _parse_sizes(sizes):
+    """Parses a Series of distinct, lower-cased serving size strings."""
+    found = sizes.str.extractall(_SIZE_PATTERN)
+    unit = found["unit"].str.replace(r"[\s.]", "", regex=True)
+    amount = found["amount"].astype(float) * found["times"].astype(float).fillna(1.0)
+
+    rows = found.index.get_level_values(0)
+    parsed = pd.DataFrame({
+        "mass": (amount * unit.map(MASS_UNITS)).groupby(rows).sum(min_count=1),
+        "volume": (amount * unit.map(VOLUME_UNITS)).groupby(rows).sum(min_count=1),
+        "pieces": amount.where(unit.isin(PIECE_UNITS)).groupby(rows).sum(min_count=1),
+    }).reindex(sizes.index)
+
+    # A bare number ("168") has always meant grams.
+    parsed["mass"] = parsed["mass"].fillna(sizes.str.extract(_NUMBER_ONLY, expand=False).astype(float))
+
+    has_mass, has_volume = parsed["mass"].notna(), parsed["volume"].notna()
+    return pd.DataFrame({
+        "grams": parsed["mass"].add(parsed["volume"], fill_value=0),
+        "pieces": parsed["pieces"],
+        "unit": np.select(
+            [has_mass & has_volume, has_mass, has_volume, parsed["pieces"].notna()],
+            ["g+ml", "g", "ml", "pc"], default="",
+        ),
+    }, index=sizes.index)
+
+
+def parse_serving_sizes(sizes):
+    """
+    Parses a ``Per Serve Size`` column in one pass over its distinct values.
+
+    Handles grams and other masses ("168 g", "1 kg"), volumes counted at
+    the density of water ("330 ml"), piece counts ("6 pcs") and compound
+    sizes ("2 pcs (120 g)", "100 g + 30 ml", "2 x 60 g"). Returns a frame
+    aligned with ``sizes``: ``grams`` (NaN when no mass or volume is given),
+    ``pieces`` and ``unit`` ("g", "ml", "g+ml", "pc" or "").
+    """
+    codes, uniques = pd.factorize(sizes)
+    # One trailing unparseable entry for missing sizes (code -1).
+    distinct = pd.Series(list(uniques) + [""], dtype=object).str.strip().str.lower()
+    parsed = _parse_sizes(distinct)
+    out = parsed.iloc[codes].set_axis(sizes.index)
+    return out.astype({"grams": float, "pieces": float, "unit": object})
+
+
+def serve_weight(df, fill=None, sizes=None):
+    """
+    Serving weight per item in grams. Sizes without a mass or volume
+    (missing, unparseable or pieces only) are set to ``fill`` (by default the
+    median of ``df``). ``sizes`` reuses a :func:`parse_serving_sizes` result.
+    """
+    if sizes is None:
+        sizes = parse_serving_sizes(df['Per Serve Size'])
+    weight = sizes["grams"]
+    return weight.fillna(weight.median() if fill is None else fill)
+
+
+def per_100g(df, weight):
+    """The :data:`PER_100G_COLUMNS` views of ``df``'s nutrients for serving weights ``weight``."""
+    factor = 100.0 / weight
+    return pd.DataFrame({
+        name: df[col] * factor for col, name in PER_100G_COLUMNS.items() if col in df.columns
+    }, index=df.index)
+
+
+def complex_carb_ratio(df):
+    """Share of carbohydrate that is not sugar."""
+    return np.where(
+        df['Total carbohydrate (g)'] > 0,
+        (df['Total carbohydrate (g)'] - df['Total Sugars (g)']) / df['Total carbohydrate (g)'],
+        1
+    )
+
+
+def add_derived_columns(df, weight_fill=None):
+    """
+    Returns a copy of a menu frame with every :data:`DERIVED_COLUMNS` entry
+    added. ``weight_fill`` is passed on to :func:`serve_weight`.
+    """
+    df = df.copy(deep=False)
+
+    names = classify_names(df['Menu Items'])
+
+    df['is_veg'] = names['is_veg']
+    df['is_processed'] = names['is_processed']
+    df['healthy_fat_ratio'] = healthy_fat_ratio(df)
+    sizes = parse_serving_sizes(df['Per Serve Size'])
+    df['serve_weight'] = serve_weight(df, weight_fill, sizes)
+    df['energy_density'] = df['Energy (kCal)'] / df['serve_weight']
+    df['complex_carb_ratio'] = complex_carb_ratio(df)
+
+    df['Texture'] = names['Texture']
+    df['Feeling'] = df['Texture'].map(lambda x: TEXTURE_FEELINGS.get(x, "😐 Neutral"))
+    df['Category'] = names['Category']
+
+    df['serve_unit'] = sizes['unit']
+    df['serve_pieces'] = sizes['pieces']
+    return df.join(per_100g(df, df['serve_weight']))
+
+
+def update_derived_columns(previous, df, matches):
+    """
+    :func:`add_derived_columns` for a new version of a menu, given the
+    featured ``previous`` version and, per row of ``df``, the position of the
+    same row in it (-1 for new or changed rows).
+
+    Only new rows are classified and parsed. Every derived column is a
+    per-row value except the weight filled in for sizes without a mass or
+    volume (the median weight of the menu), so kept rows are only touched
+    when that median moves.
+    """
+    matches = np.asarray(matches)
+    kept = matches >= 0
+    columns = [col for col in DERIVED_COLUMNS if col in previous.columns]
+    old = previous[columns].iloc[matches[kept]].set_axis(df.index[kept])
+    added = df[~kept]
+
+    parts = [old]
+    if len(added):
+        parts.append(add_derived_columns(added, np.nan)[columns])
+    derived = pd.concat(parts).reindex(df.index)
+
+    # Sizes without a mass or volume get the median of the parsed weights.
+    filled = derived['serve_unit'].isin(["", "pc"])
+    fill = derived['serve_weight'].mask(filled).median()
+    refill = derived.index[filled & (derived['serve_weight'] != fill)]
+    if len(refill):
+        rows = df.loc[refill]
+        derived.loc[refill, 'serve_weight'] = fill
+        derived.loc[refill, 'energy_density'] = rows['Energy (kCal)'] / fill
+        scaled = per_100g(rows, pd.Series(fill, index=refill))
+        derived.loc[refill, scaled.columns] = scaled
+    return df.join(derived)
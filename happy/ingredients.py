@@ -0,0 +1,181 @@
+"""
+Sparse item x ingredient matrix for allergen and intolerance exclusion.
+
+Items are linked to ingredients from two sources:
+
+- the region's optional ingredients table beside its menu files
+  (``<Region>_Menu_Ingredients.csv``, e.g. ``India_Menu_Ingredients.csv``),
+  one row per (``Menu Items``, ``Ingredient``) pair (linking every menu row
+  of that name), with an optional ``Allergen Group`` column naming one of
+  :data:`ALLERGEN_GROUPS` explicitly. A region without one falls back to
+  the item names alone, never to another region's table
+- the disorder keywords found in the item name itself, treated as
+  ingredients, so items missing from the table behave as before
+
+The links form a CSR (items x ingredients) matrix. Each ingredient belongs to
+the allergen groups whose keywords occur in its name (or that the table
+names instead: a table group replaces the inferred ones, and ``none``
+clears them), which gives a sparse (ingredients x groups) matrix, and a single
+sparse product yields the ``contains_<group>`` column for every item. An
+exclusion is then a boolean lookup rather than a per-row keyword scan.
+"""
+import hashlib
+import io
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from happy import menu_store, timing
+from happy.matcher import classify_items, menu_matcher
+
+# Allergen group -> lexicon in happy.lexicons
+ALLERGEN_GROUPS = {
+    "dairy": "dairy",
+    "gluten": "gluten",
+    "pcos_avoid": "pcos_avoid",
+    "nuts": "allergen:nuts",
+    "soy": "allergen:soy",
+    "shellfish": "allergen:shellfish",
+}
+
+
+@dataclass(frozen=True)
+class IngredientMatrix:
+    items: "sparse.csr_array"      # items x ingredients, 1 where the item contains it
+    ingredients: list
+    groups: "sparse.csr_array"     # ingredients x groups, 1 where it belongs to the group
+    group_names: list
+    item_groups: np.ndarray        # items x groups, precomputed items @ groups > 0
+
+    def contains(self, group):
+        """Boolean vector of items containing any ingredient of ``group``."""
+        vec = self.groups[:, [self.group_names.index(group)]]
+        return (self.items @ vec).toarray().ravel() > 0
+
+    def group_columns(self, index=None):
+        """``contains_<group>`` boolean columns for every allergen group."""
+        columns = [f"contains_{group}" for group in self.group_names]
+        return pd.DataFrame(self.item_groups, index=index, columns=columns)
+
+
+def build_ingredient_matrix(menu, table=None):
+    """Builds the :class:`IngredientMatrix` for a menu frame and optional table."""
+    from scipy import sparse  # Only when a matrix is built, not on page import
+
+    matcher = menu_matcher()
+    group_lexicons = [matcher.lexicons.index(lex) for lex in ALLERGEN_GROUPS.values()]
+    # Keywords of any allergen lexicon double as name-derived ingredients.
+    name_kw = np.flatnonzero(matcher.membership[:, group_lexicons].any(axis=1))
+
+    ingredients = [matcher.keywords[k] for k in name_kw]
+    if table is not None:
+        table = table.dropna(subset=["Menu Items", "Ingredient"])
+        ingredients += list(table["Ingredient"].str.strip().str.lower())
+    ingredients = sorted(set(ingredients))
+    ing_index = {ing: i for i, ing in enumerate(ingredients)}
+
+    # ---- Item x Ingredient links ----
+    item_rows, item_cols = np.nonzero(matcher.keyword_hits(menu["Menu Items"])[:, name_kw])
+    item_cols = np.array([ing_index[matcher.keywords[name_kw[c]]] for c in item_cols], dtype=np.int64)
+
+    group_rows, group_cols = [], []
+    curated = np.zeros(len(ingredients), dtype=bool)  # Groups named by the table, not inferred
+    if table is not None:
+        # Every menu row of a linked name, duplicates included.
+        item_pos = pd.DataFrame({"Menu Items": menu["Menu Items"].astype(object), "row": np.arange(len(menu))})
+        linked = table.assign(**{"Menu Items": table["Menu Items"].astype(object)}).merge(item_pos, on="Menu Items")
+        item_rows = np.concatenate([item_rows, linked["row"].to_numpy()])
+        item_cols = np.concatenate([
+            item_cols,
+            linked["Ingredient"].str.strip().str.lower().map(ing_index).to_numpy(dtype=np.int64),
+        ])
+
+        if "Allergen Group" in table.columns:
+            named = table.dropna(subset=["Allergen Group"])
+            ing = named["Ingredient"].str.strip().str.lower().map(ing_index)
+            group = named["Allergen Group"].str.strip().str.lower()
+            known = group.isin(ALLERGEN_GROUPS)
+            curated[ing[known | (group == "none")].to_numpy(dtype=np.int64)] = True
+            group_rows += list(ing[known])
+            group_cols += [list(ALLERGEN_GROUPS).index(g) for g in group[known]]
+
+    items = sparse.csr_array(
+        (np.ones(len(item_rows), dtype=np.int32), (item_rows, item_cols)),
+        shape=(len(menu), len(ingredients)),
+    )
+
+    # ---- Ingredient x Group membership ----
+    hits = classify_items(pd.Series(ingredients, dtype=object))[list(ALLERGEN_GROUPS.values())].to_numpy() > 0
+    hits[curated] = False  # The table's groups replace the inferred ones
+    rows, cols = np.nonzero(hits)
+    groups = sparse.csr_array(
+        (np.ones(len(rows) + len(group_rows), dtype=np.int32),
+         (np.concatenate([rows, group_rows]).astype(np.int64),
+          np.concatenate([cols, group_cols]).astype(np.int64))),
+        shape=(len(ingredients), len(ALLERGEN_GROUPS)),
+    )
+
+    # Duplicate links sum to counts; only presence matters.
+    for matrix in (items, groups):
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+
+    item_groups = (items @ groups).toarray() > 0
+    return IngredientMatrix(items, ingredients, groups, list(ALLERGEN_GROUPS), item_groups)
+
+
+@lru_cache(maxsize=2)
+def _read_table(path, stat):
+    data = Path(path).read_bytes()
+    table = pd.read_csv(io.BytesIO(data), dtype=str)
+    table.columns = table.columns.str.strip()
+    return hashlib.sha1(data).hexdigest(), table
+
+
+def table_path(name=menu_store.MENU_FILE):
+    """The ingredients table of a menu file's region: ``<Region>_Menu_Ingredients.csv`` beside it."""
+    path = menu_store.resolve_path(name)
+    stem = path.name.removesuffix(".csv").removesuffix("_New")
+    return path.with_name(f"{stem}_Ingredients.csv")
+
+
+def _table_entry(name):
+    # The table has its own schema, so it is not read through the menu store.
+    path = table_path(name)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None, None  # No table for this region: ingredients come from the item names
+    return _read_table(str(path), (st.st_mtime_ns, st.st_size))
+
+
+def table_version(name=menu_store.MENU_FILE):
+    """Content hash of a menu file's ingredients table, or None when its region has none."""
+    return _table_entry(name)[0]
+
+
+def load_table(name=menu_store.MENU_FILE):
+    """A menu file's ingredients table (all columns as strings), or None when its region has none."""
+    return _table_entry(name)[1]
+
+
+@menu_store.versioned_cache(maxsize=8)
+def _cached_matrix(name, version, table_version):
+    menu = menu_store.load_menu(name)
+    table = load_table(name) if table_version else None
+    with timing.stage("classify"):
+        return build_ingredient_matrix(menu, table)
+
+
+def load_ingredient_matrix(name=menu_store.MENU_FILE):
+    """The ingredient matrix for a menu file, built once per data version."""
+    return _cached_matrix(name, menu_store.menu_version(name), table_version(name))
+
+
+def allergen_columns(name=menu_store.MENU_FILE):
+    """``contains_<group>`` columns for a menu file, aligned with ``load_menu``."""
+    return load_ingredient_matrix(name).group_columns(menu_store.load_menu(name).index)
@@ -0,0 +1,51 @@
+"""
+Keyword lexicons used to classify menu items by name.
+
+Every lexicon is compiled into the one shared matcher in ``matcher.py``, so
+adding a lexicon here does not add another pass over the menu.
+"""
+
+# ---- Soul: Vegetarian & Processing Keywords ----
+NON_VEG_KEYWORDS = ["chicken", "beef", "mutton", "fish", "prawn", "egg", "sausage"]
+PROCESSED_KEYWORDS = ["fried", "nuggets", "muffin", "sausage"]
+
+# ---- Mood: Veg/Non-Veg Category Keywords ----
+MOOD_NON_VEG_KEYWORDS = ["chicken", "egg", "fish", "beef", "mutton", "bacon", "pepperoni", "sausage"]
+
+# ---- Texture: Lexicon & Feelings ----
+TEXTURE_LEXICON = {
+    "Crispy 🍟": ["crispy", "crunchy", "brittle", "fried", "nuggets"],
+    "Chewy 🍬": ["chewy", "tough", "rubbery", "gum"],
+    "Soft 🥞": ["soft", "fluffy", "tender", "muffin", "burger"],
+    "Smooth ☕": ["smooth", "velvety", "creamy", "flat white"]
+}
+
+TEXTURE_FEELINGS = {
+    "Crispy 🍟": "⚡ Energizing",
+    "Chewy 🍬": "💪 Satisfying",
+    "Soft 🥞": "🛌 Comforting",
+    "Smooth ☕": "🌊 Soothing",
+    "Unknown ❓": "😐 Neutral"
+}
+
+# ---- Disorders: Intolerance & Allergen Keywords ----
+DAIRY_KEYWORDS = ["milk", "cheese", "cream", "butter", "yogurt", "paneer"]
+GLUTEN_KEYWORDS = ["wheat", "barley", "rye", "bread", "pasta", "roti"]
+PCOS_AVOID_KEYWORDS = ["milk", "cheese", "bread", "pasta", "sugar", "fried"]
+ALLERGEN_MAP = {
+    "nuts": ["almond", "cashew", "peanut", "walnut"],
+    "soy": ["soy", "tofu"],
+    "shellfish": ["shrimp", "crab", "lobster"],
+}
+
+# ---- Registry: Lexicon Name -> Keywords ----
+LEXICONS = {
+    "non_veg": NON_VEG_KEYWORDS,
+    "processed": PROCESSED_KEYWORDS,
+    "mood_non_veg": MOOD_NON_VEG_KEYWORDS,
+    **{f"texture:{texture}": keywords for texture, keywords in TEXTURE_LEXICON.items()},
+    "dairy": DAIRY_KEYWORDS,
+    "gluten": GLUTEN_KEYWORDS,
+    "pcos_avoid": PCOS_AVOID_KEYWORDS,
+    **{f"allergen:{allergen}": keywords for allergen, keywords in ALLERGEN_MAP.items()},
+}
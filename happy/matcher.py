@@ -0,0 +1,109 @@
+"""
+Compiled multi-keyword matcher for menu item names.
+
+The classifiers used to run ``any(word in name for word in keywords)`` per
+row and per lexicon. :class:`KeywordMatcher` instead compiles every keyword
+of every lexicon into one Aho-Corasick automaton and scans each distinct
+(lower-cased) item name once, so the cost grows with the length of the text
+rather than with rows x keywords.
+"""
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from happy.lexicons import LEXICONS
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over the keywords of several lexicons."""
+
+    def __init__(self, lexicons):
+        self.lexicons = list(lexicons)
+        self.keywords = sorted({kw.lower() for kws in lexicons.values() for kw in kws})
+        kw_index = {kw: i for i, kw in enumerate(self.keywords)}
+
+        # Keyword -> lexicon membership, so keyword hits become lexicon counts
+        # with one matrix product.
+        self.membership = np.zeros((len(self.keywords), len(self.lexicons)), dtype=np.int32)
+        for j, name in enumerate(self.lexicons):
+            for kw in set(k.lower() for k in lexicons[name]):
+                self.membership[kw_index[kw], j] = 1
+
+        self._delta, self._out = self._compile(self.keywords)
+
+    @staticmethod
+    def _compile(keywords):
+        """Builds the trie, failure links and a full transition table."""
+        goto = [{}]
+        out = [()]
+        for kid, kw in enumerate(keywords):
+            node = 0
+            for ch in kw:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    out.append(())
+                    nxt = len(goto) - 1
+                    goto[node][ch] = nxt
+                node = nxt
+            out[node] += (kid,)
+
+        # Breadth-first: resolve failure links into a deterministic automaton,
+        # so scanning never walks back up the trie.
+        delta = [dict(edges) for edges in goto]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            out[node] += out[fail[node]]
+            for ch, nxt in goto[node].items():
+                fail[nxt] = delta[fail[node]].get(ch, 0)
+                queue.append(nxt)
+            for ch, nxt in delta[fail[node]].items():
+                delta[node].setdefault(ch, nxt)
+        return delta, out
+
+    def _scan(self, text):
+        """Returns the ids of every keyword occurring in ``text``."""
+        delta, out = self._delta, self._out
+        found = set()
+        node = 0
+        for ch in text:
+            node = delta[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def keyword_hits(self, names):
+        """Boolean (items x keywords) matrix of which keywords occur in each name."""
+        codes, uniques = pd.factorize(pd.Series(names, dtype=object).str.lower())
+        unique_hits = np.zeros((len(uniques), len(self.keywords)), dtype=bool)
+        for i, text in enumerate(uniques):
+            unique_hits[i, list(self._scan(text))] = True
+
+        hits = np.zeros((len(codes), len(self.keywords)), dtype=bool)
+        valid = codes >= 0  # Missing names match nothing
+        hits[valid] = unique_hits[codes[valid]]
+        return hits
+
+    def match(self, names):
+        """
+        Counts, per item and lexicon, how many distinct keywords of the
+        lexicon occur in the item name.
+        """
+        index = names.index if isinstance(names, pd.Series) else None
+        counts = self.keyword_hits(names).astype(np.int32) @ self.membership
+        return pd.DataFrame(counts, index=index, columns=self.lexicons)
+
+
+@lru_cache(maxsize=None)
+def menu_matcher():
+    """The process-wide matcher compiled from every lexicon in ``lexicons.py``."""
+    return KeywordMatcher(LEXICONS)
+
+
+def classify_items(names):
+    """Per-item hit counts for every registered lexicon, from a single scan."""
+    return menu_matcher().match(names)
@@ -0,0 +1,314 @@
+"""
+Process-wide menu store.
+
+Every page reads the menu CSVs through :func:`load_menu` instead of calling
+``pd.read_csv`` itself. Each file is parsed once per process with explicit
+dtypes and cleaned column names, and is only parsed again when the file on
+disk actually changes (checked by mtime/size, confirmed by content hash).
+
+When an up-to-date snapshot built by ``python -m happy.snapshot`` exists,
+the frame is memory-mapped from it instead of parsed, and
+:func:`load_features` serves the snapshot's precomputed derived columns.
+
+A new version of a file is matched row by row against the one it replaces
+(:func:`row_matches`), so only changed or added rows are reclassified
+(``features.update_derived_columns``) and rescored (``scoring.py``).
+:func:`watch` moves the change checks to a background thread: watched files
+are served from memory without a ``stat`` per call, and each new version is
+parsed and swapped in whole while sessions keep reading the previous one.
+
+Modules that derive frames, indexes or models from a menu cache them per
+data version with :func:`versioned_cache`.
+"""
+import functools
+import hashlib
+import os
+import threading
+import time
+import traceback
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from happy import features, snapshot, timing
+
+# ---- Menu Files ----
+ROOT = Path(__file__).resolve().parent.parent
+MENU_FILE = "India_Menu.csv"
+MENU_NEW_FILE = "India_Menu_New.csv"
+
+# ---- Schema ----
+TEXT_COLUMNS = ["Menu Category", "Menu Items", "Per Serve Size", "Veg/Non-Veg"]
+NUTRIENT_COLUMNS = [
+    "Energy (kCal)", "Protein (g)", "Total fat (g)", "Sat Fat (g)",
+    "Trans fat (g)", "Cholesterols (mg)", "Total carbohydrate (g)",
+    "Total Sugars (g)", "Added Sugars (g)", "Sodium (mg)",
+]
+DTYPES = {**{col: str for col in TEXT_COLUMNS}, **{col: "float64" for col in NUTRIENT_COLUMNS}}
+
+
+@dataclass(frozen=True)
+class _Entry:
+    stat: tuple
+    version: str
+    frame: pd.DataFrame
+    featured: pd.DataFrame = None
+    previous: str = None        # Version this one replaced
+    matches: np.ndarray = None  # Per row, its row in ``previous`` (-1: new or changed)
+    hashes: np.ndarray = None   # Per row content hash, kept to match the next version
+
+
+_entries = {}
+_lock = threading.Lock()
+
+# ---- File Watcher ----
+_watched = {}         # Resolved path -> menu name, checked by the watcher instead of on every call
+_on_change = []       # Called with the menu name after each swap
+_watcher = None
+
+
+def resolve_path(name):
+    """Resolves a menu file name against the repository root."""
+    path = Path(name)
+    return path if path.is_absolute() else ROOT / path
+
+
+def _file_stat(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _column_dtypes(path):
+    header = pd.read_csv(path, nrows=0).columns
+    return {raw: DTYPES[raw.strip()] for raw in header if raw.strip() in DTYPES}
+
+
+def _clean(df):
+    df.columns = df.columns.str.strip()  # Remove accidental spaces
+
+    if "Veg/Non-Veg" in df.columns:
+        df["Veg/Non-Veg"] = df["Veg/Non-Veg"].str.strip().str.title()
+    return df
+
+
+def parse_menu(path):
+    """Parses a menu CSV with explicit dtypes and normalized column names."""
+    return _clean(pd.read_csv(path, dtype=_column_dtypes(path)))
+
+
+def iter_menu_chunks(path, chunksize):
+    """Parses a menu CSV like :func:`parse_menu`, ``chunksize`` rows at a time."""
+    with pd.read_csv(path, dtype=_column_dtypes(path), chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield _clean(chunk)
+
+
+def row_hashes(frame):
+    """A content hash per row of a menu frame."""
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def match_rows(old, new):
+    """For each row hash in ``new``, the position of the same hash in ``old`` (-1 if there is none)."""
+    # First position of each distinct row in the previous version.
+    hashes, first = np.unique(old, return_index=True)
+    if not len(hashes):
+        return np.full(len(new), -1, dtype=np.int64)
+    found = np.searchsorted(hashes, new).clip(max=len(hashes) - 1)
+    return np.where(hashes[found] == new, first[found], -1).astype(np.int64)
+
+
+def _load(name, path, stat, entry):
+    """A new entry for ``path``, reusing what it can of ``entry`` (the version it replaces)."""
+    data = path.read_bytes()
+    version = hashlib.sha1(data).hexdigest()
+    if entry is not None and entry.version == version:
+        # Touched but unchanged: keep the parsed frames.
+        return replace(entry, stat=stat)
+
+    featured = snapshot.load_snapshot(name, version)
+    if featured is not None:
+        base = [col for col in featured.columns if col not in features.DERIVED_COLUMNS]
+        frame = featured[base]
+    else:
+        frame = parse_menu(path)
+    if entry is None or list(entry.frame.columns) != list(frame.columns):
+        return _Entry(stat, version, frame, featured)
+
+    hashes = row_hashes(frame)
+    matches = match_rows(row_hashes(entry.frame) if entry.hashes is None else entry.hashes, hashes)
+    if featured is None and entry.featured is not None:
+        with timing.stage("classify"):
+            featured = features.update_derived_columns(entry.featured, frame, matches)
+    return _Entry(stat, version, frame, featured, entry.version, matches, hashes)
+
+
+def _entry(name):
+    path = resolve_path(name)
+    key = str(path)
+    entry = _entries.get(key)
+    if entry is not None and key in _watched:
+        return entry  # Kept current by the watcher
+
+    stat = _file_stat(path)
+    if entry is not None and entry.stat == stat:
+        return entry
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry.stat == stat:
+            return entry
+        entry = _entries[key] = _load(name, path, stat, entry)
+        return entry
+
+
+def load_menu(name=MENU_FILE):
+    """
+    Returns the shared frame for a menu file.
+
+    The result is a shallow copy, so pages may add their own columns, but the
+    underlying data is shared by every page and session and must be treated
+    as read-only.
+    """
+    return _entry(name).frame.copy(deep=False)
+
+
+def load_features(name=MENU_FILE):
+    """
+    Returns the shared frame for a menu file with the derived columns from
+    ``features.py`` added (read-only, like :func:`load_menu`).
+    """
+    entry = _entry(name)
+    if entry.featured is None:
+        with timing.stage("classify"):
+            featured = features.add_derived_columns(entry.frame)
+        with _lock:
+            current = _entries.get(str(resolve_path(name)))
+            if current is not None and current.version == entry.version:
+                _entries[str(resolve_path(name))] = replace(current, featured=featured)
+        return featured.copy(deep=False)
+    return entry.featured.copy(deep=False)
+
+
+def menu_row_hashes(name=MENU_FILE):
+    """The :func:`row_hashes` of a menu file, computed once per data version."""
+    entry = _entry(name)
+    if entry.hashes is None:
+        hashes = row_hashes(entry.frame)
+        with _lock:
+            current = _entries.get(str(resolve_path(name)))
+            if current is not None and current.version == entry.version:
+                _entries[str(resolve_path(name))] = replace(current, hashes=hashes)
+        return hashes
+    return entry.hashes
+
+
+def menu_version(name=MENU_FILE):
+    """Returns the content hash of a menu file, for keying derived caches."""
+    return _entry(name).version
+
+
+def previous_version(name=MENU_FILE):
+    """The version a menu file's current one replaced in this process (None for the first load)."""
+    return _entry(name).previous
+
+
+def row_matches(name, since):
+    """
+    For each row of a menu file, its row in version ``since`` (-1 if new or
+    changed), or None unless the current version directly replaced ``since``.
+    """
+    entry = _entry(name)
+    return entry.matches if entry.previous == since else None
+
+
+def versioned_cache(maxsize=8):
+    """
+    ``functools.lru_cache`` for builders keyed by data version, except that
+    concurrent calls with the same arguments build once: pages, the API and
+    the warm-up thread share these builders, and the others wait for the
+    first call's result instead of repeating its work.
+    """
+    def decorate(build):
+        cached = functools.lru_cache(maxsize=maxsize)(build)
+        building = {}  # Arguments -> lock held while they are being built
+        guard = threading.Lock()
+
+        @functools.wraps(build)
+        def wrapper(*args):
+            with guard:
+                lock = building.setdefault(args, threading.Lock())
+            try:
+                with lock:
+                    return cached(*args)
+            finally:
+                with guard:
+                    if building.get(args) is lock:
+                        del building[args]
+
+        wrapper.cache_clear = cached.cache_clear
+        wrapper.cache_info = cached.cache_info
+        return wrapper
+    return decorate
+
+
+# ------------------------------
+# File Watcher
+# ------------------------------
+def _poll(pending):
+    """Swaps in every watched file whose ``stat`` changed and then held still for one poll."""
+    for key in list(_watched):
+        entry = _entries.get(key)
+        if entry is None:
+            continue  # Not loaded yet: the first load reads it
+        path = Path(key)
+        try:
+            stat = _file_stat(path)
+        except OSError:
+            continue  # Being replaced: keep serving the current version
+        if stat == entry.stat or pending.get(key) != stat:
+            pending[key] = stat  # Wait until a writer has finished
+            continue
+        del pending[key]
+
+        name = _watched[key]
+        try:
+            new = _load(name, path, stat, entry)
+        except (OSError, ValueError):
+            continue  # Half-written or malformed: keep the current version and try again
+        with _lock:
+            _entries[key] = new
+        if new.version != entry.version:
+            for callback in list(_on_change):
+                try:
+                    callback(name)
+                except Exception:
+                    traceback.print_exc()  # Keep watching; the next request rebuilds what failed
+
+
+def _watch_loop(interval):
+    pending = {}
+    while True:
+        time.sleep(interval)
+        _poll(pending)
+
+
+def watch(names, interval=2.0, on_change=None):
+    """
+    Watches menu files for changes from a background thread (started once
+    per process). Each new version is swapped in whole once the file has
+    stopped changing for ``interval`` seconds, and ``on_change(name)`` is
+    then called, for example to warm the new version's caches.
+    """
+    global _watcher
+    with _lock:
+        for name in names:
+            _watched[str(resolve_path(name))] = name
+        if on_change is not None and on_change not in _on_change:
+            _on_change.append(on_change)
+        if _watcher is None:
+            _watcher = threading.Thread(target=_watch_loop, args=(interval,), name="menu-watcher", daemon=True)
+            _watcher.start()
+    return _watcher
@@ -0,0 +1,86 @@
+"""
+Vectorized mood support scores.
+
+The mood page used to loop over the menu with ``iterrows`` on every click.
+The score only depends on the mood rating through the low-mood multiplier,
+so there are just two distinct score vectors; :func:`mood_score_table`
+computes both with column arithmetic once per data version and a request
+becomes a column lookup plus a top-k, and each (bucket, category) top list
+is computed once per data version (:func:`cached_items`).
+"""
+import numpy as np
+import pandas as pd
+
+from happy import menu_store, results, timing
+from happy.ranking import top_k_rows
+
+LOW_MOOD_MAX = 3          # Ratings at or below this count as a low mood
+LOW_MOOD_MULTIPLIER = 1.5
+MOOD_BUCKETS = ["low", "normal"]
+
+
+def mood_bucket(mood_rating):
+    """Maps a 1-10 mood rating to its score bucket."""
+    return "low" if mood_rating <= LOW_MOOD_MAX else "normal"
+
+
+def mood_score_table(df):
+    """Computes the mood support score of every item for every mood bucket."""
+    sugars = df['Total Sugars (g)'].to_numpy(dtype=float)
+    protein = df['Protein (g)'].to_numpy(dtype=float)
+
+    # High-quality carbs boost serotonin; low-quality carbs cause sugar crashes
+    score = np.where(sugars < 5, 3.0, 0.0) + np.where(sugars > 10, -3.0, 0.0)
+    # Higher protein supports neurotransmitter function
+    score = score + protein * 0.2
+
+    return pd.DataFrame({
+        "low": score * LOW_MOOD_MULTIPLIER,
+        "normal": score,
+    }, index=df.index)
+
+
+@menu_store.versioned_cache(maxsize=8)
+def _cached_scores(name, version):
+    df = menu_store.load_menu(name)
+    with timing.stage("score"):
+        return mood_score_table(df)
+
+
+def load_mood_scores(name=menu_store.MENU_NEW_FILE):
+    """The mood score table for a menu file, computed once per data version."""
+    return _cached_scores(name, menu_store.menu_version(name))
+
+
+def calculate_mood_score(df, mood_rating, scores=None):
+    """Returns ``df`` with the ``Mood Support Score`` column for ``mood_rating``."""
+    if scores is None:
+        scores = mood_score_table(df)
+    df = df.copy(deep=False)
+    df['Mood Support Score'] = scores[mood_bucket(mood_rating)]
+    return df
+
+
+def recommend_items(df, category, top_n=3):
+    """Filters by category (Veg/Non-Veg), ranks items by Mood Support Score, and returns recommendations."""
+    mask = df['Category'].str.lower() == category.lower()
+    return top_k_rows(df, 'Mood Support Score', top_n, mask=mask)
+
+
+def cached_items(name, mood_rating, category, top_n=3):
+    """
+    The ``top_n`` recommendations of a menu file for a mood rating and
+    category, from the shared result cache. Ratings in the same bucket share
+    one entry.
+    """
+    def compute():
+        with timing.page("mood"):
+            with timing.stage("load"):
+                df, scores = menu_store.load_features(name), load_mood_scores(name)
+            with timing.stage("score"):
+                df = calculate_mood_score(df, mood_rating, scores)
+            return recommend_items(df, category, top_n)
+
+    return results.remember(
+        "mood", (name, mood_bucket(mood_rating), category, top_n), menu_store.menu_version(name), compute,
+    )
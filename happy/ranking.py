@@ -0,0 +1,50 @@
+"""
+Shared top-k ranking.
+
+Every recommender used to run a full ``sort_values(...).head(n)``. The
+helpers here select the top ``k`` with ``np.partition`` (O(n)) and only sort
+those ``k``, with an optional boolean mask in place of a filtered copy.
+Ties keep menu order and missing scores rank last, so results are stable
+across runs.
+"""
+import numpy as np
+
+from happy import timing
+
+
+def top_k(scores, k, mask=None, ascending=False):
+    """
+    Returns the positions of the ``k`` best scores, best first.
+
+    ``ascending=True`` ranks the lowest scores first. Only positions where
+    ``mask`` is true are considered.
+    """
+    scores = np.asarray(scores, dtype=float)
+    candidates = np.arange(len(scores)) if mask is None else np.flatnonzero(np.asarray(mask, dtype=bool))
+    keys = scores[candidates] if ascending else -scores[candidates]
+
+    missing = np.isnan(keys)
+    if missing.any():
+        ranked = top_k(keys[~missing], k, ascending=True)
+        tail = candidates[missing][: max(k - len(ranked), 0)]
+        return np.concatenate([candidates[~missing][ranked], tail])
+
+    k = min(max(k, 0), len(keys))
+    if k == 0:
+        return candidates[:0]
+    if k < len(keys):
+        kth = np.partition(keys, k - 1)[k - 1]
+        better = np.flatnonzero(keys < kth)
+        ties = np.flatnonzero(keys == kth)[: k - len(better)]  # Earliest ties win
+        selected = np.concatenate([better, ties])
+    else:
+        selected = np.arange(len(keys))
+
+    order = np.lexsort((selected, keys[selected]))
+    return candidates[selected[order]]
+
+
+def top_k_rows(df, column, k, mask=None, ascending=False):
+    """Returns the ``k`` best rows of ``df`` by ``column``, best first."""
+    with timing.stage("rank"):
+        return df.iloc[top_k(df[column].to_numpy(dtype=float), k, mask=mask, ascending=ascending)]
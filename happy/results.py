@@ -0,0 +1,140 @@
+"""
+Shared, bounded result cache.
+
+Recommendation tables (the Body meals, the Mood top 3, the Soul top 10s, a
+texture's items, a condition's recommendations) depend only on a handful of
+discrete inputs and the data version, yet every page rerun of every session
+used to recompute them. :func:`remember` keeps them in one process-wide cache
+keyed by ``(page, parameters, data version)``, shared by all sessions and
+the JSON API.
+
+The cache is bounded by size (``max_bytes``, estimated per entry) and count
+(``max_entries``), evicting the least recently used entries first, and drops
+entries older than ``ttl`` seconds. A new data version simply stops hitting
+the old keys, which then age out. :func:`stats` reports hits, misses,
+evictions and expirations, to size the cache for the expected concurrency.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+# ---- Default Bounds ----
+MAX_BYTES = 64 * 1024 * 1024
+MAX_ENTRIES = 4096
+TTL_SECONDS = 3600
+
+
+def estimate_size(value):
+    """Approximate memory held by a cached value, in bytes."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+def _share(value):
+    # Shallow copies: callers can add columns without touching the cached frame.
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_share(item) for item in value)
+    return value
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a byte budget, an entry limit and a TTL."""
+
+    def __init__(self, max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (value, size, stored at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and self._clock() - entry[2] > self.ttl:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Stores ``value``, evicting LRU entries; values over the byte budget are not kept."""
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, self._clock())
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+            }
+
+
+_MISSING = object()
+cache = ResultCache()
+
+
+def remember(page, params, version, compute):
+    """
+    Returns ``compute()`` for ``(page, params, version)``, from the shared
+    cache when possible. ``params`` and ``version`` must be hashable;
+    ``version`` is the content hash (or tuple of hashes) of the data the
+    result was computed from. Concurrent misses on one key may both compute.
+    """
+    key = (page, params, version)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.put(key, value)
+    return _share(value)
+
+
+def stats():
+    """Hit/miss/eviction counters and current size of the shared cache."""
+    return cache.stats()
@@ -0,0 +1,288 @@
+"""
+Declarative scoring engine.
+
+Body (``Energetic_Score`` ...), disorders (``Diabetes_Score``,
+``PCOS_Score``) and soul (``vibrational_score``) scores are all weighted sums
+of min-max normalized menu columns. Each score is declared here as a
+:class:`ScoreSpec` of :class:`Term` entries (feature, direction, weight), and
+:class:`ScoringEngine` compiles them against one shared, read-only float32
+matrix of normalized features:
+
+    scores = X @ W + b
+
+so every score of every item comes out of a single matmul, computed once per
+data version by :func:`load_engine`.
+
+Direction ``"+"`` uses the normalized feature, ``"-"`` its inverse
+(``1 - norm``) and ``"raw"`` the unnormalized value (0/1 flags). ``fill``
+optionally fills missing values with the column's ``"mean"`` or
+``"median"`` first; the same column with different fills is a different
+feature.
+
+The disorders page normalizes within a filtered subset rather than over the
+whole menu. :meth:`ScoringEngine.score` reproduces that exactly from the
+shared matrix by rescaling the weights with the subset's min/max, instead of
+refitting scalers.
+
+The engine keeps each feature's min/max and fill value (:attr:`ScoringEngine.stats`).
+When a menu file changes, :func:`load_engine` builds the new engine over the
+previous one: a feature whose min and max did not move keeps the normalized
+values of unchanged rows, so only new rows (and filled rows, when the mean
+or median moved) are normalized again. A feature is only rescaled in full
+when one of its extremes moves.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from happy import menu_store, timing
+
+
+@dataclass(frozen=True)
+class Term:
+    feature: str
+    direction: str
+    weight: float
+    fill: str = None
+
+    @property
+    def key(self):
+        return (self.feature, self.fill, self.direction == "raw")
+
+
+@dataclass(frozen=True)
+class ScoreSpec:
+    name: str
+    terms: tuple
+
+
+# ---- Body: How You Want To Feel ----
+BODY_SCORES = [
+    ScoreSpec("Energetic_Score", (
+        Term("Total carbohydrate (g)", "+", 0.5),
+        Term("Protein (g)", "+", 0.5),
+    )),
+    ScoreSpec("Lean_Score", (
+        Term("Protein (g)", "+", 0.6),
+        Term("Total fat (g)", "+", -0.4),
+    )),
+    ScoreSpec("Satiated_Score", (
+        Term("Protein (g)", "+", 0.5),
+        Term("Total fat (g)", "+", 0.5),
+    )),
+    ScoreSpec("Avoid_Bloating_Score", (
+        Term("Sodium (mg)", "+", -0.5, fill="mean"),
+        Term("Total carbohydrate (g)", "+", -0.3),
+        Term("Added Sugars (g)", "+", -0.2),
+    )),
+]
+
+# ---- Disorders: Condition Scores ----
+DISORDER_SCORES = [
+    ScoreSpec("Diabetes_Score", (
+        Term("Total Sugars (g)", "+", 0.6),
+        Term("Total carbohydrate (g)", "+", 0.4),
+        Term("Protein (g)", "+", -0.3),
+    )),
+    ScoreSpec("PCOS_Score", (
+        Term("Protein (g)", "+", 0.5),
+        Term("Total Sugars (g)", "+", -0.3),
+        Term("Total carbohydrate (g)", "+", -0.2),
+    )),
+]
+
+# ---- Soul: Vibrational Score ----
+# (weight key, term) pairs, so the Soul page can re-weight them live.
+SOUL_TERMS = [
+    ("w_protein",      Term("Protein (g)", "+", 0.15)),
+    ("w_trans",        Term("Trans fat (g)", "-", 0.10)),
+    ("w_added_sugars", Term("Added Sugars (g)", "-", 0.10)),
+    ("w_sodium",       Term("Sodium (mg)", "-", 0.10, fill="median")),
+    ("w_sat",          Term("Sat Fat (g)", "-", 0.08)),
+    ("w_veg",          Term("is_veg", "raw", 0.08)),
+    ("w_healthy_fat",  Term("healthy_fat_ratio", "+", 0.07)),
+    ("w_energy",       Term("energy_density", "-", 0.08)),
+    ("w_complex_carb", Term("complex_carb_ratio", "+", 0.10)),
+    ("w_cholesterol",  Term("Cholesterols (mg)", "-", 0.10)),
+    ("w_processed",    Term("is_processed", "raw", -0.08)),
+]
+SOUL_SCORES = [ScoreSpec("vibrational_score", tuple(term for _, term in SOUL_TERMS))]
+
+ALL_SCORES = BODY_SCORES + DISORDER_SCORES + SOUL_SCORES
+
+
+def feature_keys(specs):
+    """The distinct ``(feature, fill, raw)`` keys used by ``specs``, in order."""
+    return list(dict.fromkeys(term.key for spec in specs for term in spec.terms))
+
+
+def feature_stats(values, fill, raw):
+    """The ``(fill value, min, max)`` the engine uses for one feature column."""
+    fill_value = getattr(np, f"nan{fill}")(values) if fill is not None else np.nan
+    if raw:
+        return fill_value, np.nan, np.nan
+    return fill_value, np.nanmin(values), np.nanmax(values)
+
+
+def _same(a, b):
+    """Element-wise equality that treats two NaNs as equal."""
+    return (a == b) | (np.isnan(a) & np.isnan(b))
+
+
+class ScoringEngine:
+    """
+    Compiles score specs against one shared normalized feature matrix.
+
+    ``stats`` optionally maps feature keys to precomputed ``(fill value, min,
+    max)`` triples (see :func:`feature_stats`), so a chunk of a larger file is
+    normalized with the whole file's statistics instead of its own.
+
+    ``previous`` is an engine over an earlier version of the same menu and
+    ``matches`` gives, per row of ``df``, the position of the same row in it
+    (-1 for new or changed rows). Features whose min and max are unchanged
+    reuse its normalized values for the matched rows whose feature value is
+    unchanged too (derived values such as ``energy_density`` can move with
+    the whole file's statistics even when the row itself did not).
+    """
+
+    def __init__(self, df, specs=ALL_SCORES, dtype=np.float32, stats=None, previous=None, matches=None):
+        self.index = df.index
+        self.specs = {spec.name: spec for spec in specs}
+        self.dtype = dtype
+
+        keys = feature_keys(specs)
+        self.features = {key: i for i, key in enumerate(keys)}
+        self.stats = {}
+        self.rescaled = set()  # Features normalized in full (all of them without ``previous``)
+
+        if (previous is not None and matches is not None and len(previous.index)
+                and previous.features == self.features and previous.dtype == dtype):
+            # Start from the previous rows; -1 picks a placeholder row that is overwritten.
+            X = previous.X[matches]
+            missing = (previous.missing[matches] if previous.missing is not None
+                       else np.zeros((len(df), len(keys)), dtype=bool))
+        else:
+            previous = None
+            X = np.empty((len(df), len(keys)), dtype=dtype)
+            missing = np.zeros((len(df), len(keys)), dtype=bool)
+        # Feature values before filling and normalizing, compared by the next version.
+        self.values = np.empty((len(df), len(keys)))
+        for i, key in enumerate(keys):
+            feature, fill, raw = key
+            values = df[feature].to_numpy(dtype=float)
+            self.values[:, i] = values
+            self.stats[key] = stats[key] if stats is not None else feature_stats(values, fill, raw)
+            fill_value, lo, hi = self.stats[key]
+
+            # Rows to normalize: all of them, unless the extremes held still.
+            if previous is not None and np.array_equal(previous.stats[key][1:], (lo, hi), equal_nan=True):
+                rows = (matches < 0) | ~_same(values, previous.values[matches, i])
+                if fill is not None and not np.array_equal(previous.stats[key][0], fill_value, equal_nan=True):
+                    rows |= np.isnan(values)
+                rows = np.flatnonzero(rows)
+                values = values[rows]
+            else:
+                self.rescaled.add(key)
+                rows = slice(None)
+
+            if fill is not None:
+                values = np.where(np.isnan(values), fill_value, values)
+            if not raw:
+                # A constant feature normalizes to 0, as MinMaxScaler does.
+                values = (values - lo) / (hi - lo) if hi > lo else np.zeros_like(values)
+            missing[rows, i] = np.isnan(values)
+            X[rows, i] = np.nan_to_num(values)
+        X.flags.writeable = False
+        self.X = X
+        # Missing values are stored as 0 so they cannot leak into scores that
+        # do not use them; scores that do are set back to NaN afterwards.
+        self.missing = missing if missing.any() else None
+
+        compiled = [self.compile(spec) for spec in specs]
+        W = np.column_stack([w for w, _ in compiled]) if compiled else np.zeros((len(keys), 0), dtype=dtype)
+        b = np.array([b for _, b in compiled], dtype=dtype)
+        table = self._apply(W, b)
+        table.flags.writeable = False
+        self._scores = pd.DataFrame(table, index=self.index, columns=list(self.specs), copy=False)
+
+    def compile(self, spec, lows=None, spans=None):
+        """
+        Compiles a spec into a weight vector and bias over the feature matrix.
+
+        ``lows``/``spans`` renormalize each feature as ``(x - lo) / span`` (in
+        globally normalized units) instead of using the global min-max.
+        """
+        w = np.zeros(len(self.features))
+        b = 0.0
+        for term in spec.terms:
+            i = self.features[term.key]
+            sign = -1.0 if term.direction == "-" else 1.0
+            if term.direction == "-":
+                b += term.weight
+            lo = 0.0 if lows is None else lows[i]
+            span = 1.0 if spans is None else spans[i]
+            if span > 0:
+                w[i] += sign * term.weight / span
+                b -= sign * term.weight * lo / span
+        return w.astype(self.dtype), self.dtype(b)
+
+    def _apply(self, W, b):
+        scores = self.X @ W + b
+        if self.missing is not None:
+            used = (np.asarray(W) != 0).astype(np.int32)
+            scores = np.where(self.missing.astype(np.int32) @ used > 0, np.nan, scores).astype(self.dtype)
+        return scores
+
+    def scores(self):
+        """Every declared score for every item (shared, read-only)."""
+        return self._scores
+
+    def evaluate(self, spec):
+        """Scores every item with an ad hoc spec over the same features."""
+        return self._apply(*self.compile(spec))
+
+    def score(self, name, mask=None):
+        """
+        One declared score for every item. With ``mask``, features are
+        normalized over the masked items only, as if the scalers were fitted
+        on that subset (values outside the mask are meaningless).
+        """
+        if mask is None:
+            return self._scores[name].to_numpy()
+
+        spec = self.specs[name]
+        rows = np.flatnonzero(np.asarray(mask, dtype=bool))
+        lows = np.zeros(len(self.features))
+        spans = np.ones(len(self.features))
+        cols = [self.features[term.key] for term in spec.terms if not term.key[2]]
+        if len(rows) and cols:
+            subset = self.X[np.ix_(rows, cols)].astype(float)
+            if self.missing is not None:
+                subset[self.missing[np.ix_(rows, cols)]] = np.nan
+            lows[cols] = np.nanmin(subset, axis=0)
+            spans[cols] = np.nanmax(subset, axis=0) - lows[cols]
+        return self._apply(*self.compile(spec, lows, spans))
+
+    def extremes(self, specs):
+        """The ``(min, max)`` of each normalized feature behind ``specs``, in :func:`feature_keys` order."""
+        return np.array([self.stats[key][1:] for key in feature_keys(specs) if not key[2]], dtype=float)
+
+
+_latest = {}  # Menu name -> (version, engine) last built, to build the next version over
+
+
+@menu_store.versioned_cache(maxsize=8)
+def _cached_engine(name, version):
+    df = menu_store.load_features(name)
+    previous_version, previous = _latest.get(name, (None, None))
+    matches = menu_store.row_matches(name, previous_version) if previous is not None else None
+    with timing.stage("score"):
+        engine = ScoringEngine(df, previous=previous, matches=matches)
+    _latest[name] = (version, engine)
+    return engine
+
+
+def load_engine(name=menu_store.MENU_FILE):
+    """The scoring engine for a menu file, built once per data version."""
+    return _cached_engine(name, menu_store.menu_version(name))
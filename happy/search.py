@@ -0,0 +1,192 @@
+"""
+Typo-tolerant, as-you-type menu item search.
+
+Item names are lower-cased, stripped of punctuation and symbols ("McAloo
+Tikki Burger®" is "mcaloo tikki burger") and cut into character trigrams,
+each word padded with two spaces so word starts and ends are trigrams of
+their own. :class:`SearchIndex` is the inverted index: the postings (name
+ids) of each distinct trigram, in one sorted array, built with array
+operations once per data version (:func:`load_index`).
+
+A query is cut into trigrams the same way, except that its last word is
+not padded at the end while still being typed, so "mcaloo tik" matches as a
+prefix. Matches must share at least :data:`MIN_SHARE` of the query's
+trigrams, so a typo (which only costs the up to three trigrams it touches)
+still matches. Shared trigrams are counted with one ``np.bincount`` over
+the query's posting lists (a query has only a handful of trigrams, so this
+beats merging the lists). Candidates are ranked by shared trigrams, then
+names whose words start with every query word, then shorter names; no
+lookup scans the names themselves.
+"""
+import math
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from happy import disorders, menu_store, mood, timing
+from happy.scoring import load_engine
+
+MIN_SHARE = 0.5      # Least share of the query's trigrams a match must have
+SHORTLIST = 4        # Candidates per result checked for whole-word prefixes
+
+_SEPARATORS = r"[\W_]+"
+
+
+def normalize(names):
+    """Lower-cased names with runs of punctuation, symbols and spaces as single spaces."""
+    return names.astype(object).str.lower().str.replace(_SEPARATORS, " ", regex=True).str.strip()
+
+
+def _distinct(values):
+    """Sorted distinct values (``np.unique`` without its hash path, much slower on large int arrays)."""
+    values = np.sort(values)
+    return values[np.concatenate([[True], values[1:] != values[:-1]])] if len(values) else values
+
+
+def _pad(words, finished=True):
+    # Two spaces around every word: "  mcaloo  tikki  " (the end only once typed).
+    return "  " + words.replace(" ", "  ") + ("  " if finished else "")
+
+
+def _trigram_codes(padded, alphabet):
+    """``(text id, trigram code)`` of every trigram of ``padded`` texts; unknown characters give -1."""
+    text = "\0".join(padded)
+    chars = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    ids = np.searchsorted(alphabet, chars).clip(max=len(alphabet) - 1)
+    ids = np.where(alphabet[ids] == chars, ids, -1).astype(np.int64)
+
+    separator = chars == 0
+    whole = ~(separator[:-2] | separator[1:-1] | separator[2:])
+    text_ids = np.cumsum(separator)[:-2][whole]
+    a, b, c = ids[:-2][whole], ids[1:-1][whole], ids[2:][whole]
+    size = len(alphabet)
+    codes = np.where((a < 0) | (b < 0) | (c < 0), -1, (a * size + b) * size + c)
+    return text_ids, codes
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    items: pd.DataFrame    # Menu Items / Menu Category, in menu order
+    rows: np.ndarray       # Per distinct name, its first menu row
+    words: np.ndarray      # Per distinct name, its normalized words (object)
+    sizes: np.ndarray      # Per distinct name, its number of distinct trigrams
+    alphabet: np.ndarray   # Sorted code points seen in the names
+    trigrams: np.ndarray   # Sorted distinct trigram codes
+    offsets: np.ndarray    # Postings of trigrams[i]: postings[offsets[i]:offsets[i + 1]]
+    postings: np.ndarray   # Name ids
+
+    @classmethod
+    def build(cls, items):
+        words = normalize(items["Menu Items"])
+        codes, distinct = pd.factorize(words)
+        rows = np.full(len(distinct), len(items), dtype=np.int64)
+        np.minimum.at(rows, codes[codes >= 0], np.flatnonzero(codes >= 0))
+        padded = [_pad(name) for name in distinct]
+
+        chars = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32)
+        alphabet = np.flatnonzero(np.bincount(chars)).astype(np.uint32) if len(chars) else chars
+        text_ids, trigrams = _trigram_codes(padded, alphabet)
+        pairs = _distinct(trigrams * len(distinct) + text_ids)  # By trigram, then name
+        trigrams, postings = np.divmod(pairs, max(len(distinct), 1))
+        starts = np.flatnonzero(np.concatenate([[True], trigrams[1:] != trigrams[:-1]])) if len(pairs) else pairs
+        keys = trigrams[starts]
+        return cls(
+            items=items[["Menu Items", "Menu Category"]].reset_index(drop=True),
+            rows=rows,
+            words=np.asarray(distinct, dtype=object),
+            sizes=np.bincount(postings, minlength=len(distinct)),
+            alphabet=alphabet,
+            trigrams=keys,
+            offsets=np.append(starts, len(postings)),
+            postings=postings,
+        )
+
+    def _query_trigrams(self, query):
+        words = re.sub(_SEPARATORS, " ", query.lower()).strip()
+        if not words or not len(self.alphabet):
+            return words, np.empty(0, dtype=np.int64)
+        _, codes = _trigram_codes([_pad(words, finished=query[-1:].isspace())], self.alphabet)
+        return words, _distinct(codes)
+
+    def _postings(self, i):
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def _candidates(self, codes):
+        """Names sharing at least :data:`MIN_SHARE` of the query trigram ``codes``, with their shared counts."""
+        empty = np.empty(0, dtype=np.int64)
+        need = max(1, math.ceil(MIN_SHARE * len(codes)))
+        if not len(codes) or not len(self.trigrams):
+            return empty, empty
+        at = np.searchsorted(self.trigrams, codes).clip(max=len(self.trigrams) - 1)
+        found = at[self.trigrams[at] == codes]
+        if len(found) < need:
+            return empty, empty
+        if len(found) == 1:
+            return self._postings(found[0]), np.ones(len(self._postings(found[0])), dtype=np.int64)
+
+        # One pass over the query's posting lists; a query has only a handful.
+        counts = np.bincount(np.concatenate([self._postings(i) for i in found]), minlength=len(self.words))
+        names = np.flatnonzero(counts >= need)
+        return names, counts[names]
+
+    def search(self, query, limit=10):
+        """Menu positions of the ``limit`` best matches for ``query``, best first."""
+        words, codes = self._query_trigrams(query)
+        candidates, shared = self._candidates(codes)
+        if not len(candidates):
+            return np.empty(0, dtype=np.int64)
+
+        # Most shared trigrams first, then the shortest names.
+        key = shared * (int(self.sizes.max()) + 1) - self.sizes[candidates]
+        top = min(limit * SHORTLIST, len(candidates))
+        best = np.argpartition(-key, top - 1)[:top] if top < len(candidates) else np.arange(len(candidates))
+        best = best[np.argsort(-key[best], kind="stable")]
+        best = candidates[best]
+
+        # Names whose words start with every query word go first.
+        query_words = words.split()
+        def prefixed(name):
+            name_words = self.words[name].split()
+            return all(any(w.startswith(q) for w in name_words) for q in query_words)
+        best = sorted(best, key=lambda name: not prefixed(name))[:limit]
+        return self.rows[np.asarray(best, dtype=np.int64)]
+
+
+@menu_store.versioned_cache(maxsize=8)
+def _cached_index(name, version):
+    with timing.stage("classify"):
+        return SearchIndex.build(menu_store.load_menu(name))
+
+
+def load_index(name=menu_store.MENU_FILE):
+    """The search index for a menu file, built once per data version."""
+    return _cached_index(name, menu_store.menu_version(name))
+
+
+def item_details(name, positions):
+    """
+    Texture, vibrational score, mood support score and per-condition
+    suitability ("✅"/"❌") of the items at menu ``positions``.
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    df = menu_store.load_features(name)
+    details = df[["Menu Items", "Menu Category", "Texture", "Feeling"]].iloc[positions].reset_index(drop=True)
+    details["vibrational_score"] = load_engine(name).score("vibrational_score")[positions].astype(float).round(3)
+    details["Mood Support Score"] = mood.load_mood_scores(name)["normal"].to_numpy()[positions].round(2)
+    excluded = disorders.load_condition_table(name).excluded[positions]
+    for i, condition in enumerate(disorders.CONDITIONS):
+        details[condition] = np.where(excluded & (1 << i), "❌", "✅")
+    return details
+
+
+def search_items(name, query, limit=10):
+    """The :func:`item_details` of the ``limit`` best matches for ``query`` in a menu file."""
+    with timing.page("search"):
+        with timing.stage("load"):
+            index = load_index(name)
+        with timing.stage("rank"):
+            positions = index.search(query, limit)
+        with timing.stage("load"):
+            return item_details(name, positions)
@@ -0,0 +1,27 @@
+"""
+Starts the Streamlit app with cache warm-up running from the start:
+
+    python -m happy.serve [streamlit options, e.g. --server.port 8501]
+
+Same as ``streamlit run main.py``, except that every region's tables are
+built in a background thread of the server process before the first visitor
+arrives (see ``warmup.py``), rather than on the first page run. Point the
+load balancer's readiness probe at ``/app/static/ready.json``: it is 404
+until warm-up has finished.
+"""
+import sys
+
+from streamlit.web import cli
+
+from happy import menu_store, warmup
+
+
+def main(argv=None):
+    warmup.clear_ready_file()
+    warmup.start(ready_file=warmup.READY_FILE)
+    sys.argv = ["streamlit", "run", str(menu_store.ROOT / "main.py"), *(sys.argv[1:] if argv is None else argv)]
+    cli.main()
+
+
+if __name__ == "__main__":
+    main()
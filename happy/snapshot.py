@@ -0,0 +1,138 @@
+"""
+Columnar binary snapshots of the menu files.
+
+``python -m happy.snapshot`` turns each menu CSV (plus its derived columns
+from ``features.py``) into a directory of ``.npy`` files:
+
+- one column-major matrix per numeric dtype (``float64.npy``, ``int64.npy``)
+- one dictionary-encoded code array per text column (``text_<i>.npy``)
+- ``strings.json``, the string table holding each text column's values
+- ``manifest.json``, the column layout and the hash of the source CSV
+
+:func:`load_snapshot` maps those files read-only with ``mmap_mode="r"`` and
+wraps them in a DataFrame without copying, so a worker only pages in the
+columns it touches. Text columns are decoded back to the dtype they were
+written with, so a snapshot frame has the same dtypes as a parsed one. A
+snapshot whose source hash no longer matches the CSV
+is ignored and the menu store falls back to parsing the CSV.
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from happy import features
+
+FORMAT_VERSION = 3
+SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / "snapshots"
+
+
+def snapshot_path(name):
+    """Returns the snapshot directory for a menu file name."""
+    return SNAPSHOT_DIR / Path(name).stem
+
+
+def build_snapshot(df, out_dir, source, source_version):
+    """Writes a featured menu frame to ``out_dir`` in snapshot format."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    blocks = {}
+    text = []
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_float_dtype(dtype):
+            blocks.setdefault("float64", []).append(col)
+        elif pd.api.types.is_integer_dtype(dtype):
+            blocks.setdefault("int64", []).append(col)
+        else:
+            text.append(col)
+
+    for dtype, cols in blocks.items():
+        matrix = np.asfortranarray(df[cols].to_numpy(dtype=dtype))
+        np.save(out_dir / f"{dtype}.npy", matrix)
+
+    strings = {}
+    for i, col in enumerate(text):
+        values = pd.Categorical(df[col])
+        np.save(out_dir / f"text_{i}.npy", values.codes)
+        strings[col] = [str(v) for v in values.categories]
+
+    with open(out_dir / "strings.json", "w", encoding="utf-8") as f:
+        json.dump(strings, f, ensure_ascii=False)
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "source": source,
+        "source_version": source_version,
+        "rows": len(df),
+        "columns": list(df.columns),
+        "blocks": blocks,
+        "text": text,
+        "text_dtypes": [str(df[col].dtype) for col in text],
+    }
+    with open(out_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def load_snapshot(name, source_version=None):
+    """
+    Maps a menu snapshot into a read-only DataFrame.
+
+    Returns None when there is no snapshot, it was written by another format
+    version, or it was built from different CSV contents than
+    ``source_version``.
+    """
+    snap_dir = snapshot_path(name)
+    try:
+        with open(snap_dir / "manifest.json", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    if manifest.get("format") != FORMAT_VERSION:
+        return None
+    if source_version is not None and manifest["source_version"] != source_version:
+        return None
+
+    frames = []
+    for dtype, cols in manifest["blocks"].items():
+        matrix = np.load(snap_dir / f"{dtype}.npy", mmap_mode="r")
+        frames.append(pd.DataFrame(matrix, columns=cols, copy=False))
+
+    with open(snap_dir / "strings.json", encoding="utf-8") as f:
+        strings = json.load(f)
+    text = {}
+    for i, (col, dtype) in enumerate(zip(manifest["text"], manifest["text_dtypes"])):
+        codes = np.load(snap_dir / f"text_{i}.npy", mmap_mode="r")
+        values = pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(strings[col]), validate=False)
+        text[col] = pd.Series(values).astype(dtype)  # As parsed: "str" or object, not category
+    frames.append(pd.DataFrame(text))
+
+    df = pd.concat(frames, axis=1)
+    return df[manifest["columns"]]
+
+
+def main(argv=None):
+    from happy import catalog, menu_store
+
+    parser = argparse.ArgumentParser(description="Build memory-mapped menu snapshots.")
+    parser.add_argument(
+        "menus", nargs="*",
+        help="menu CSV files to snapshot (default: every region in the catalog)",
+    )
+    args = parser.parse_args(argv)
+
+    menus = args.menus or [name for part in catalog.regions().values() for name in (part.menu, part.menu_new)]
+    for name in menus:
+        df = features.add_derived_columns(menu_store.parse_menu(menu_store.resolve_path(name)))
+        out_dir = snapshot_path(name)
+        manifest = build_snapshot(df, out_dir, name, menu_store.menu_version(name))
+        print(f"{name}: {manifest['rows']} rows -> {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Soul vibrational score.
+
+The score's terms are declared in ``scoring.py`` and evaluated against the
+shared normalized feature matrix, built once per data version. Scoring with
+any set of weights is then a single matrix-vector product
+(:func:`vibrational_scores`), cheap enough to re-rank on every slider
+change; the resulting top-10 tables are shared across sessions per
+(weights, data version) in ``results.py``.
+"""
+from dataclasses import replace
+
+from happy import catalog, menu_store, results, timing
+from happy.ranking import top_k_rows
+from happy.scoring import SOUL_TERMS, ScoreSpec, load_engine
+
+# ---- Slider Labels per Weight Key ----
+WEIGHT_LABELS = {
+    "w_protein":      "Protein",
+    "w_trans":        "Low trans fat",
+    "w_added_sugars": "Low added sugars",
+    "w_sodium":       "Low sodium",
+    "w_sat":          "Low saturated fat",
+    "w_veg":          "Vegetarian",
+    "w_healthy_fat":  "Healthy fat ratio",
+    "w_energy":       "Low energy density",
+    "w_complex_carb": "Complex carb ratio",
+    "w_cholesterol":  "Low cholesterol",
+    "w_processed":    "Processed (penalty)",
+}
+# Penalties lower the score; their weights are shown and set as positive numbers.
+PENALTY_TERMS = {key for key, term in SOUL_TERMS if term.weight < 0}
+DEFAULT_WEIGHTS = {key: abs(term.weight) for key, term in SOUL_TERMS}
+
+# Displayed alongside the score in the high/low vibe tables
+DISPLAY_COLUMNS = [
+    'Menu Items', 'vibrational_score', 'Protein (g)', 'Trans fat (g)',
+    'Added Sugars (g)', 'Sodium (mg)', 'Sat Fat (g)', 'healthy_fat_ratio',
+    'energy_density', 'complex_carb_ratio', 'Cholesterols (mg)',
+    'is_processed', 'is_veg'
+]
+
+
+def soul_spec(weights=None):
+    """The vibrational score spec for a ``{weight key: weight}`` mapping."""
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    return ScoreSpec("vibrational_score", tuple(
+        replace(term, weight=-weights[key] if key in PENALTY_TERMS else weights[key])
+        for key, term in SOUL_TERMS
+    ))
+
+
+def vibrational_scores(engine, weights=None):
+    """Composite "vibrational" score of every item for the given weights."""
+    return engine.evaluate(soul_spec(weights))
+
+
+@menu_store.versioned_cache(maxsize=8)
+def _cached_display(name, version):
+    df = menu_store.load_features(name)
+    # Fill missing Sodium (mg) values with the median.
+    df['Sodium (mg)'] = df['Sodium (mg)'].fillna(df['Sodium (mg)'].median())
+    return df
+
+
+def load_soul_features(name=menu_store.MENU_FILE):
+    """
+    The soul display frame and scoring engine for a menu file, both built
+    once per data version. The frame is a shallow copy of shared data: treat
+    it as read-only.
+    """
+    version = menu_store.menu_version(name)
+    return _cached_display(name, version).copy(deep=False), load_engine(name)
+
+
+def _weights_key(weights):
+    return tuple(sorted({**DEFAULT_WEIGHTS, **(weights or {})}.items()))
+
+
+def cached_vibe_tables(name, weights=None, top_n=10):
+    """
+    The high-vibe vegetarian and low-vibe ``top_n`` tables of a menu file for
+    ``weights``, from the shared result cache.
+    """
+    def compute():
+        with timing.page("soul"):
+            with timing.stage("load"):
+                df, engine = load_soul_features(name)
+            with timing.stage("score"):
+                df['vibrational_score'] = vibrational_scores(engine, weights)
+            high = top_k_rows(df, 'vibrational_score', top_n, mask=df['is_veg'] == 1)
+            low = top_k_rows(df, 'vibrational_score', top_n, ascending=True)
+            return high[DISPLAY_COLUMNS], low[DISPLAY_COLUMNS]
+
+    return results.remember(
+        "soul", (name, _weights_key(weights), top_n), menu_store.menu_version(name), compute,
+    )
+
+
+def cached_global_top(top_n=10):
+    """The ``top_n`` high-vibe vegetarian items across every region (default weights)."""
+    def compute():
+        with timing.page("soul"):
+            with timing.stage("load"):
+                all_regions = catalog.load_all_scores()
+            top = top_k_rows(all_regions, 'vibrational_score', top_n, mask=all_regions['is_veg'] == 1)
+            return top[['Region'] + DISPLAY_COLUMNS]
+
+    return results.remember("soul_global", (top_n,), catalog.catalog_version(), compute)
@@ -0,0 +1,95 @@
+"""
+Per-page cold-start report.
+
+Runs every page once in a fresh Python process, as a new Streamlit worker
+would, and reports how long the first run takes against a budget:
+
+    python -m happy.startup [--budget-ms 1500] [--output startup_report.json] [--check]
+
+For each page the report has the time to import Streamlit (paid once per
+server, the same for every page), the first run (page imports, data loading,
+rendering), a warm rerun, and which heavy dependencies the page pulled in.
+``--check`` exits non-zero when a page is over budget, for CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from happy import menu_store
+
+PAGES = ["main.py"] + sorted(
+    str(path.relative_to(menu_store.ROOT)) for path in (menu_store.ROOT / "pages").glob("*.py")
+)
+HEAVY_MODULES = ["pandas", "numpy", "scipy", "sklearn", "pyarrow", "streamlit_extras"]
+DEFAULT_BUDGET_MS = 1500
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+before = set(sys.modules)
+at = AppTest.from_file({path!r}, default_timeout=120).run()
+first = time.perf_counter()
+at.run()
+rerun = time.perf_counter()
+loaded = {{name.split(".")[0] for name in set(sys.modules) - before}}
+print(json.dumps({{
+    "streamlit_import_ms": (imported - start) * 1000,
+    "first_run_ms": (first - imported) * 1000,
+    "rerun_ms": (rerun - first) * 1000,
+    "heavy_imports": sorted(loaded & set({heavy!r})),
+    "errors": [str(e.value) for e in at.exception],
+}}))
+"""
+
+
+def measure_page(page):
+    """Cold-start timings of one page, measured in a fresh interpreter."""
+    env = {**os.environ, "PYTHONPATH": str(menu_store.ROOT)}
+    code = _PROBE.format(path=str(menu_store.ROOT / page), heavy=HEAVY_MODULES)
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=menu_store.ROOT, env=env,
+        capture_output=True, text=True, check=False,
+    )
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        return {"page": page, "errors": proc.stderr.strip().splitlines()[-1:] or ["no output"]}
+    return {"page": page, **json.loads(lines[-1])}
+
+
+def report(pages=PAGES, budget_ms=DEFAULT_BUDGET_MS):
+    results = [measure_page(page) for page in pages]
+    for result in results:
+        result["over_budget"] = bool(result["errors"]) or result["first_run_ms"] > budget_ms
+    return {"budget_ms": budget_ms, "pages": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure every page's cold-start time.")
+    parser.add_argument("pages", nargs="*", default=PAGES, help="page scripts (default: every page)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="first-run budget per page")
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any page is over budget")
+    args = parser.parse_args(argv)
+
+    result = report(args.pages, args.budget_ms)
+    print(f"{'page':<22} {'streamlit':>10} {'first run':>10} {'rerun':>8}  heavy imports")
+    for page in result["pages"]:
+        if page["errors"] and "first_run_ms" not in page:
+            print(f"{page['page']:<22} failed: {page['errors'][0]}")
+            continue
+        flag = "  OVER BUDGET" if page["over_budget"] else ""
+        print(f"{page['page']:<22} {page['streamlit_import_ms']:>8.0f}ms {page['first_run_ms']:>8.0f}ms "
+              f"{page['rerun_ms']:>6.0f}ms  {', '.join(page['heavy_imports']) or '-'}{flag}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.check and any(page["over_budget"] for page in result["pages"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Healthier swaps: the items closest in nutrient profile to a given item that
+score better on a chosen objective.
+
+Profiles are the normalized nutrient features behind the Body scores
+(``BODY_SCORES`` in ``scoring.py``), read straight from the shared scoring
+engine's matrix. :func:`load_index` builds the index once per data version;
+each objective's part of it is built on first use.
+
+Sorted from best to worst score, the items that beat a given item are a
+prefix of that order. Like a Fenwick tree, the order is cut into aligned
+power-of-two blocks, each with its own KD-tree, so any prefix is the union
+of at most log2(n) blocks plus a short remainder. A query asks each block's
+tree for its ``top_n`` nearest items (pruned by the best distances found so
+far) and compares the remainder directly: every candidate already scores
+better, so no query ever scans past worse items. The trees hold about
+``log2(n / DIRECT_MAX) / 2`` copies of the profiles per objective.
+"""
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from happy import menu_store, timing
+from happy.scoring import BODY_SCORES, feature_keys, load_engine
+
+# ---- Objectives (score column -> label) ----
+OBJECTIVES = {
+    "vibrational_score": "🌟 Vibrational",
+    "Lean_Score": "🏋️ Lean",
+    "Energetic_Score": "⚡ Energetic",
+    "Satiated_Score": "🍛 Satiated",
+    "Avoid_Bloating_Score": "💨 Avoid Bloating",
+    "Diabetes_Score": "🩺 Diabetes-friendly",
+    "PCOS_Score": "🩺 PCOS-friendly",
+}
+LOWER_IS_BETTER = {"Diabetes_Score"}  # Ranked ascending on the Disorders page
+
+PROFILE_KEYS = [key for key in feature_keys(BODY_SCORES) if not key[2]]
+DIRECT_MAX = 1024  # Blocks start at this size; shorter remainders are compared directly
+
+
+@dataclass(frozen=True)
+class Ranking:
+    """One objective's items from best to worst, with KD-trees over aligned blocks."""
+    goodness: np.ndarray  # Per item, higher is better (NaN: unscored)
+    order: np.ndarray     # Scored items, best first
+    descending: np.ndarray  # -goodness of ``order``, ascending for searchsorted
+    blocks: dict          # End of block in order -> cKDTree over its items
+
+    @classmethod
+    def build(cls, scores, lower_is_better, profiles):
+        from scipy.spatial import cKDTree  # Only when an index is built, not on page import
+
+        goodness = np.asarray(scores, dtype=float) * (-1.0 if lower_is_better else 1.0)
+        valid = np.flatnonzero(~np.isnan(goodness))
+        order = valid[np.argsort(-goodness[valid], kind="stable")]
+
+        blocks = {}
+        size = DIRECT_MAX
+        while size <= len(order):
+            # Blocks of this size end at odd multiples of it (their lowest set bit).
+            for end in range(size, len(order) + 1, 2 * size):
+                blocks[end] = cKDTree(profiles[order[end - size:end]])
+            size *= 2
+        return cls(goodness, order, -goodness[order], blocks)
+
+    def count_better(self, pos):
+        """How many items score strictly better than ``pos`` (a prefix of :attr:`order`)."""
+        if np.isnan(self.goodness[pos]):
+            return 0
+        return int(np.searchsorted(self.descending, -self.goodness[pos], "left"))
+
+
+@dataclass
+class SwapIndex:
+    items: pd.DataFrame   # Menu Items / Menu Category, in menu order
+    profiles: np.ndarray  # Normalized nutrient profile per item
+    positions: dict       # Lower-cased item name -> first menu position
+    scores: pd.DataFrame  # Every engine score per item
+    _rankings: dict = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def position(self, item):
+        """Menu position of the first item named ``item`` (case-insensitive)."""
+        return self.positions[item.strip().lower()]
+
+    def ranking(self, objective):
+        """The :class:`Ranking` of ``objective``, built on first use."""
+        ranking = self._rankings.get(objective)
+        if ranking is None:
+            with self._lock:
+                ranking = self._rankings.get(objective)
+                if ranking is None:
+                    ranking = self._rankings[objective] = Ranking.build(
+                        self.scores[objective], objective in LOWER_IS_BETTER, self.profiles
+                    )
+        return ranking
+
+    def neighbours(self, pos, objective, top_n=5):
+        """``(positions, distances)`` of the ``top_n`` closest items scoring better than ``pos``."""
+        ranking = self.ranking(objective)
+        end = ranking.count_better(pos)
+        target = self.profiles[pos]
+
+        # Remainder below the block size: compare directly.
+        blocks_end = end - end % DIRECT_MAX
+        candidates = ranking.order[blocks_end:end]
+        distances = np.linalg.norm(self.profiles[candidates] - target, axis=1)
+        if len(candidates) > top_n:
+            nearest = np.argpartition(distances, top_n)[:top_n]
+            candidates, distances = candidates[nearest], distances[nearest]
+
+        # Whole blocks, largest last: one pruned k-NN query each.
+        while blocks_end > 0:
+            size = blocks_end & -blocks_end
+            bound = np.sort(distances)[top_n - 1] if len(distances) >= top_n else np.inf
+            found_d, found = ranking.blocks[blocks_end].query(
+                target, k=min(top_n, size), distance_upper_bound=bound * (1 + 1e-9) + 1e-12
+            )
+            found_d, found = np.atleast_1d(found_d), np.atleast_1d(found)
+            hit = np.isfinite(found_d)
+            candidates = np.concatenate([candidates, ranking.order[blocks_end - size + found[hit]]])
+            distances = np.concatenate([distances, found_d[hit]])
+            blocks_end -= size
+
+        order = np.lexsort((candidates, distances))[:top_n]
+        return candidates[order], distances[order]
+
+
+def build_index(df, engine):
+    """A :class:`SwapIndex` over a menu frame and its scoring engine."""
+    items = df[["Menu Items", "Menu Category"]].reset_index(drop=True)
+    names = items["Menu Items"].astype(object).str.strip().str.lower()
+    return SwapIndex(
+        items=items,
+        profiles=np.ascontiguousarray(engine.X[:, [engine.features[key] for key in PROFILE_KEYS]], dtype=float),
+        positions=dict(zip(names[::-1], names.index[::-1])),
+        scores=engine.scores().reset_index(drop=True),
+    )
+
+
+@menu_store.versioned_cache(maxsize=8)
+def _cached_index(name, version):
+    return build_index(menu_store.load_menu(name), load_engine(name))
+
+
+def load_index(name=menu_store.MENU_NEW_FILE):
+    """The swap index for a menu file, built once per data version."""
+    return _cached_index(name, menu_store.menu_version(name))
+
+
+def healthier_swaps(name, item, objective, top_n=5):
+    """
+    The ``top_n`` items of a menu file most similar to ``item`` that score
+    better on ``objective`` (one of :data:`OBJECTIVES`), closest first.
+    Raises ``KeyError`` for an unknown item.
+    """
+    with timing.page("swaps"):
+        index = load_index(name)
+        pos = index.position(item)
+        with timing.stage("rank"):
+            positions, distances = index.neighbours(pos, objective, top_n)
+        swaps = index.items.iloc[positions].copy()
+        swaps[objective] = index.scores[objective].to_numpy(dtype=float)[positions].round(3)
+        swaps["Distance"] = np.round(distances, 3)
+        return swaps.reset_index(drop=True)
@@ -0,0 +1,29 @@
+"""
+Texture page lookups over the precomputed ``Texture``/``Feeling`` columns.
+"""
+from happy import menu_store, results, timing
+from happy.lexicons import TEXTURE_FEELINGS, TEXTURE_LEXICON
+
+TEXTURES = list(TEXTURE_LEXICON)
+
+
+def items_with_texture(df, texture_choice, top_n=10):
+    """The first ``top_n`` items classified as ``texture_choice``."""
+    filtered_df = df[df['Texture'] == texture_choice]
+    return filtered_df[['Menu Items', 'Texture', 'Feeling']].head(top_n)
+
+
+def cached_items_with_texture(name, texture_choice, top_n=10):
+    """:func:`items_with_texture` for a menu file, from the shared result cache."""
+    def compute():
+        with timing.page("texture"):
+            with timing.stage("load"):
+                df = menu_store.load_features(name)
+            with timing.stage("rank"):
+                return items_with_texture(df, texture_choice, top_n)
+
+    return results.remember("texture", (name, texture_choice, top_n), menu_store.menu_version(name), compute)
+
+
+def texture_feeling(texture_choice):
+    return TEXTURE_FEELINGS.get(texture_choice, "😐 Neutral")
@@ -0,0 +1,18 @@
+"""
+Shared page theme.
+
+The stylesheets live in ``static/`` and are served by Streamlit's static
+file serving (``.streamlit/config.toml``), so the browser downloads and
+caches them once. A rerun only sends a few ``@import`` lines instead of the
+page's whole CSS block. Poppins is bundled in ``static/fonts/`` and served
+the same way, rather than fetched from Google Fonts.
+"""
+import streamlit as st
+
+STATIC_URL = "app/static"  # Relative, so it also works under server.baseUrlPath
+
+
+def apply_theme(*sheets):
+    """Loads ``theme.css`` plus the named page sheets (``"landing"``, ``"aura"``, ``"mood"``)."""
+    imports = "\n".join(f'@import url("{STATIC_URL}/{name}.css");' for name in ("theme", *sheets))
+    st.markdown(f"<style>\n{imports}\n</style>", unsafe_allow_html=True)
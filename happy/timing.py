@@ -0,0 +1,191 @@
+"""
+Per-stage latency histograms.
+
+Every page goes through the same stages: ``load`` (menu frames and cached
+tables), ``classify`` (keyword texture/processed/allergen flags), ``score``
+(normalization and weighted scores), ``rank`` (top-k) and ``render``
+(Streamlit elements). Wrapping a stage in :func:`stage` records its duration
+under the current page, set with :func:`page`:
+
+    with timing.page("soul"), timing.stage("rank"):
+        ...
+
+Stages may nest: a cold ``load`` includes the ``classify`` and ``score``
+stages it triggers, which are recorded on their own as well. Each
+(page, stage) keeps Prometheus-style cumulative buckets plus a window of
+recent samples for p50/p95/p99. :func:`summary` feeds the diagnostics view,
+and :func:`prometheus_text`/:func:`write_textfile` export everything
+(including the result cache counters) in the Prometheus text format, e.g.
+for node_exporter's textfile collector.
+"""
+import contextvars
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from happy import results
+
+STAGES = ["load", "classify", "score", "rank", "render"]
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WINDOW = 2048  # Recent samples kept per (page, stage) for percentiles
+QUANTILES = (0.5, 0.95, 0.99)
+
+_current_page = contextvars.ContextVar("page", default="other")
+
+
+class Histogram:
+    """Cumulative latency buckets (seconds) and a window of recent samples."""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=WINDOW)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+
+    def quantiles(self):
+        if not self.recent:
+            return {q: float("nan") for q in QUANTILES}
+        values = np.quantile(np.fromiter(self.recent, float), QUANTILES)
+        return dict(zip(QUANTILES, values.tolist()))
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+@contextmanager
+def page(name):
+    """Records the stages run inside the block under page ``name``."""
+    token = _current_page.set(name)
+    try:
+        yield
+    finally:
+        _current_page.reset(token)
+
+
+@contextmanager
+def stage(name):
+    """Times the block as stage ``name`` of the current page."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(_current_page.get(), name, time.perf_counter() - start)
+
+
+def observe(page_name, stage_name, seconds):
+    with _lock:
+        histogram = _histograms.get((page_name, stage_name))
+        if histogram is None:
+            histogram = _histograms[(page_name, stage_name)] = Histogram()
+        histogram.observe(seconds)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def summary():
+    """One row per (page, stage): sample count, mean and p50/p95/p99 in milliseconds."""
+    with _lock:
+        rows = []
+        for (page_name, stage_name), histogram in sorted(_histograms.items()):
+            quantiles = histogram.quantiles()
+            rows.append({
+                "page": page_name,
+                "stage": stage_name,
+                "count": histogram.count,
+                "mean_ms": histogram.total / histogram.count * 1000,
+                **{f"p{round(q * 100)}_ms": value * 1000 for q, value in quantiles.items()},
+            })
+        return rows
+
+
+# ------------------------------
+# Prometheus Export
+# ------------------------------
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def prometheus_text():
+    """Stage histograms, recent quantiles and result cache counters in Prometheus text format."""
+    lines = [
+        "# HELP happy_stage_seconds Latency of the shared page stages.",
+        "# TYPE happy_stage_seconds histogram",
+    ]
+    quantile_lines = [
+        "# HELP happy_stage_recent_seconds Quantiles of the most recent stage latencies.",
+        "# TYPE happy_stage_recent_seconds gauge",
+    ]
+    with _lock:
+        for (page_name, stage_name), histogram in sorted(_histograms.items()):
+            for bound, count in zip(BUCKETS, histogram.counts):
+                lines.append(f"happy_stage_seconds_bucket{_labels(page=page_name, stage=stage_name, le=bound)} {count}")
+            lines.append(f"happy_stage_seconds_bucket{_labels(page=page_name, stage=stage_name, le='+Inf')} {histogram.count}")
+            lines.append(f"happy_stage_seconds_sum{_labels(page=page_name, stage=stage_name)} {histogram.total:.6f}")
+            lines.append(f"happy_stage_seconds_count{_labels(page=page_name, stage=stage_name)} {histogram.count}")
+            for q, value in histogram.quantiles().items():
+                quantile_lines.append(
+                    f"happy_stage_recent_seconds{_labels(page=page_name, stage=stage_name, quantile=q)} {value:.6f}"
+                )
+
+    cache = results.stats()
+    for name in ("hits", "misses", "evictions", "expirations"):
+        lines += [f"# TYPE happy_result_cache_{name}_total counter", f"happy_result_cache_{name}_total {cache[name]}"]
+    for name in ("entries", "bytes"):
+        lines += [f"# TYPE happy_result_cache_{name} gauge", f"happy_result_cache_{name} {cache[name]}"]
+    return "\n".join(lines + quantile_lines) + "\n"
+
+
+def write_textfile(path):
+    """Atomically writes :func:`prometheus_text` to ``path``."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # One per writing thread
+    try:
+        with open(tmp, "w") as f:
+            f.write(prometheus_text())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+_exporters = {}
+
+
+def start_exporter(path, interval=15.0):
+    """
+    Rewrites ``path`` every ``interval`` seconds from a daemon thread (once
+    per path). A failed write is logged and retried on the next tick.
+    """
+    path = os.path.abspath(path)
+    with _lock:
+        if path in _exporters:
+            return _exporters[path]
+
+        def loop():
+            while True:
+                try:
+                    write_textfile(path)
+                except Exception:
+                    traceback.print_exc()  # Keep exporting; the next write may succeed
+                time.sleep(interval)
+
+        thread = _exporters[path] = threading.Thread(target=loop, name="happy-metrics", daemon=True)
+    thread.start()
+    return thread
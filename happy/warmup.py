@@ -0,0 +1,151 @@
+"""
+Background cache warm-up.
+
+Every page builds its per-data-version frames, score tables and indexes on
+first use (the Body clusters, the disorders tables, the texture and other
+keyword classifications ...), so the first visitor to each page used to pay
+for all of it. :func:`start` builds them for every region in a background
+thread as soon as the server starts, then keeps them current by watching the
+menu files (``menu_store.watch``).
+
+:func:`status` is the readiness signal. A region that fails to warm is
+logged and skipped (its pages build what they need on first use), and
+warm-up ends ``"degraded"`` instead of ``"ready"``, which still counts as
+ready:
+
+- the JSON API answers ``GET /ready`` with 503 until warm-up has finished,
+  then 200 (``GET /health`` stays a plain liveness check)
+- ``python -m happy.serve`` starts the Streamlit app with warm-up running
+  from the start, and writes ``static/ready.json`` (served at
+  ``/app/static/ready.json``, 404 until then) once it has finished
+- the ``/?diagnostics`` view shows its progress
+"""
+import json
+import os
+import threading
+import time
+import traceback
+
+from happy import catalog, menu_store, timing
+
+READY_FILE = menu_store.ROOT / "static" / "ready.json"
+
+_status = {"state": "idle", "regions": 0, "done": 0, "seconds": None, "error": None}
+_lock = threading.Lock()
+_thread = None
+
+
+def warm_region(part):
+    """Loads one region's menu frames and score tables."""
+    # Imported here, in the warm-up thread, so starting it costs a page run nothing.
+    from happy import body, combos, disorders, mood, search, soul, swaps
+
+    body.load_body_data(part.menu_new)
+    mood.load_mood_scores(part.menu_new)
+    menu_store.load_features(part.menu_new)
+    soul.load_soul_features(part.menu)
+    disorders.load_disorder_data(part.menu)
+    disorders.load_condition_table(part.menu)
+    swaps.load_index(part.menu_new)
+    combos.load_combo_table(part.menu)
+    search.load_index(part.menu)
+
+
+def warm_up(regions=None):
+    """
+    Warms every region (``regions``: by default all of them) and the
+    cross-region score table; returns the names of the regions that failed.
+    """
+    failed = []
+    for done, part in enumerate((regions or catalog.regions()).values(), 1):
+        try:
+            warm_region(part)
+        except Exception:
+            traceback.print_exc()
+            failed.append(part.name)
+        _update(done=done)
+    if failed:
+        return failed  # The cross-region table needs every region
+    try:
+        catalog.load_all_scores()
+    except Exception:
+        traceback.print_exc()
+        failed.append("all regions")
+    return failed
+
+
+def _update(**changes):
+    with _lock:
+        _status.update(changes)
+
+
+def status():
+    """``{"state": "idle" | "warming" | "ready" | "degraded" | "failed", "regions", "done", "seconds", "error"}``."""
+    with _lock:
+        return dict(_status)
+
+
+def is_ready():
+    return status()["state"] in ("ready", "degraded")
+
+
+def _write_ready_file(path, info):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(info))
+    os.replace(tmp, path)  # Probes never see a partial file
+
+
+def clear_ready_file(path=READY_FILE):
+    """Removes a readiness file left by an earlier server."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _rewarm(name):
+    """Warms the regions that read a menu file the watcher has just swapped in."""
+    for part in catalog.regions().values():
+        if name in (part.menu, part.menu_new):
+            warm_region(part)
+
+
+def _run(ready_file):
+    regions = catalog.regions()
+    _update(state="warming", regions=len(regions), done=0)
+    start = time.perf_counter()
+    try:
+        with timing.page("warmup"), timing.stage("load"):
+            failed = warm_up(regions)
+    except Exception as e:
+        # Pages still build what they need on first use.
+        _update(state="failed", error=f"{type(e).__name__}: {e}", seconds=time.perf_counter() - start)
+        raise
+    finally:
+        menu_store.watch(
+            [name for part in regions.values() for name in (part.menu, part.menu_new)], on_change=_rewarm,
+        )
+    if failed:
+        _update(state="degraded", error=f"Failed to warm: {', '.join(failed)}", seconds=time.perf_counter() - start)
+    else:
+        _update(state="ready", seconds=time.perf_counter() - start)
+    if ready_file is not None:
+        try:
+            _write_ready_file(ready_file, status())
+        except OSError:
+            pass  # Read-only deployment: rely on /ready or the diagnostics view
+
+
+def start(ready_file=None):
+    """
+    Starts warm-up in a background thread, once per process, and then the
+    menu file watcher, which warms each new version as it is swapped in.
+    ``ready_file`` is written when warm-up has finished.
+    """
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, args=(ready_file,), name="warm-up", daemon=True)
+            _thread.start()
+    return _thread
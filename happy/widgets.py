@@ -0,0 +1,29 @@
+"""
+Streamlit widgets shared by the pages.
+"""
+import streamlit as st
+
+from happy import catalog, warmup
+
+
+@st.cache_resource
+def start_warm_up():
+    """Starts warm-up and the menu watcher once per server process (if ``happy.serve`` has not)."""
+    return warmup.start()
+
+
+def region_selector():
+    """
+    Sidebar region picker, shown on every data page. The choice is kept in
+    ``st.session_state["region"]`` so it carries over between pages. Returns
+    the selected :class:`~happy.catalog.Region`.
+    """
+    start_warm_up()
+    regions = catalog.regions()
+    names = list(regions)
+    current = st.session_state.get("region", catalog.DEFAULT_REGION)
+    index = names.index(current) if current in names else 0
+
+    choice = st.sidebar.selectbox("🌍 Region", names, index=index)
+    st.session_state["region"] = choice
+    return regions[choice]
@@ -0,0 +1,68 @@
+import streamlit as st
+
+from happy import timing
+from happy.combos import CAPS, DEFAULT_CAPS, OBJECTIVES, cached_combo, load_combo_table
+from happy.disorders import CONDITIONS
+from happy.theme import apply_theme
+from happy.widgets import region_selector
+
+# ---- Page Configuration ----
+st.set_page_config(page_title="Combo Builder", page_icon="🍱", layout="centered")
+
+# ---- Custom Styling ----
+apply_theme("aura")
+
+# ---- Title ----
+st.markdown("<h1>🍱 Combo Builder</h1>", unsafe_allow_html=True)
+st.markdown("<p>✨ Build the best combo for your goal, within your limits ✨</p>", unsafe_allow_html=True)
+
+# ---- Region Selection (sidebar) ----
+region = region_selector()
+
+
+# ---- Combo Builder (fragment) ----
+# The best combo is a branch-and-bound search over the menu's categories,
+# shared across sessions per (slots, goal, limits, condition) (happy.combos).
+@st.fragment
+def combo_builder(region):
+    with timing.page("combos"), timing.stage("load"):
+        categories = list(dict.fromkeys(load_combo_table(region.menu)["Menu Category"]))
+
+    # ---- Slots ----
+    st.write("#### Pick your combo slots:")
+    count = st.number_input("Number of items", min_value=1, max_value=5, value=3)
+    defaults = ["Regular Menu", "Regular Menu", "Beverages Menu"]
+    columns = st.columns(count)
+    slots = [
+        col.selectbox(
+            f"Item {i + 1}", categories,
+            index=categories.index(defaults[i]) if i < len(defaults) and defaults[i] in categories else 0,
+        )
+        for i, col in enumerate(columns)
+    ]
+
+    # ---- Goal, Limits & Condition ----
+    objective = st.selectbox("Make it best for:", list(OBJECTIVES), format_func=OBJECTIVES.get)
+    condition = st.selectbox("Health condition:", ["None", *CONDITIONS])
+    st.write("#### Limits for the whole combo (leave empty for none):")
+    caps = {}
+    for col, (nutrient, _) in zip(st.columns(2) * len(CAPS), CAPS.items()):
+        caps[nutrient] = col.number_input(nutrient, min_value=0.0, value=DEFAULT_CAPS.get(nutrient), step=10.0)
+
+    combo, exact = cached_combo(region.menu, slots, objective, caps, None if condition == "None" else condition)
+
+    with timing.page("combos"), timing.stage("render"):
+        if combo.empty:
+            st.error("No combo fits these limits! Try raising them or changing the slots.")
+            return
+        st.markdown(f"<div class='highlight-box'>✨ Your best combo for {OBJECTIVES[objective]}! ✨</div>",
+                    unsafe_allow_html=True)
+        st.dataframe(combo.rename(columns=OBJECTIVES), use_container_width=True)
+        totals = combo[[nutrient for nutrient, cap in caps.items() if cap is not None]].sum()
+        for col, (nutrient, total) in zip(st.columns(max(1, len(totals))), totals.items()):
+            col.metric(nutrient, f"{total:.0f}", f"{caps[nutrient] - total:.0f} left", delta_color="off")
+        if not exact:
+            st.caption("Best combo found within the time budget; there may be a slightly better one.")
+
+
+combo_builder(region)
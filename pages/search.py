@@ -0,0 +1,46 @@
+import streamlit as st
+
+from happy import timing
+from happy.search import load_index, search_items
+from happy.theme import apply_theme
+from happy.widgets import region_selector
+
+# ---- Page Configuration ----
+st.set_page_config(page_title="Item Search", page_icon="🔎", layout="centered")
+
+# ---- Custom Styling ----
+apply_theme("aura")
+
+# ---- Title ----
+st.markdown("<h1>🔎 Find Your Item</h1>", unsafe_allow_html=True)
+st.markdown("<p>✨ Type an item name, typos welcome, to see its vibes at a glance ✨</p>", unsafe_allow_html=True)
+
+# ---- Region Selection (sidebar) ----
+region = region_selector()
+try:
+    with timing.page("search"), timing.stage("load"):
+        load_index(region.menu)  # Trigram index, built once per data version
+except FileNotFoundError:
+    st.error("⚠️ Error: Menu file not found. Please check the file path.")
+    st.stop()
+
+
+# ---- Item Search (fragment) ----
+# The input commits after a short typing pause, and only this fragment
+# reruns: each lookup reads the trigram index (happy.search), never the names.
+@st.fragment
+def item_search(region):
+    query = st.text_input("Search the menu", type="search", live="200ms", placeholder="e.g. McAloo Tikki")
+    if not query.strip():
+        return
+
+    results = search_items(region.menu, query)
+
+    with timing.page("search"), timing.stage("render"):
+        if results.empty:
+            st.warning(f"⚠️ No items found for '{query}'. Try another spelling!")
+        else:
+            st.dataframe(results, use_container_width=True, hide_index=True)
+
+
+item_search(region)
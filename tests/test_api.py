@@ -0,0 +1,42 @@
+"""Request handling of the JSON API (happy.api)."""
+import asyncio
+import json
+import logging
+
+import pytest
+
+from happy import api
+
+
+@pytest.mark.parametrize("target", [
+    "/recommend/soul?w_protein=nan",
+    "/recommend/soul?w_protein=inf",
+    "/recommend/combo?slots=beverages&max_kcal=nan",
+    "/recommend/combo?slots=beverages&max_kcal=-inf",
+    "/recommend/disorders?condition=diabetes,lactose&weights=nan,1",
+])
+def test_non_finite_numbers_are_rejected(target):
+    status, payload = api.dispatch("GET", target)
+    assert status == 400
+    assert "finite" in json.loads(payload)["error"]
+
+
+def test_internal_errors_are_logged(monkeypatch, caplog):
+    def fail(params):
+        raise RuntimeError("boom")
+    monkeypatch.setitem(api.ROUTES, "/search", fail)
+
+    async def request():
+        server = await asyncio.start_server(api.handle_connection, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(b"GET /search?q=failing-request HTTP/1.1\r\nConnection: close\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        server.close()
+        return response
+
+    with caplog.at_level(logging.ERROR, logger="happy.api"):
+        response = asyncio.run(request())
+    assert response.startswith(b"HTTP/1.1 500")
+    assert "GET /search?q=failing-request failed" in caplog.text
+    assert "RuntimeError: boom" in caplog.text
@@ -0,0 +1,38 @@
+"""Saved Body page cluster models (happy.clusters)."""
+import os
+
+import numpy as np
+import pytest
+
+from happy import clusters
+from happy.body import body_features
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(clusters, "MODEL_DIR", tmp_path)
+    return tmp_path / "Menu"
+
+
+def test_update_starts_from_replaced_version_and_prunes_older(model_dir):
+    hashes, X = body_features()
+    clusters.save_model(clusters.fit_model(hashes, X, k=3), clusters.model_path("Menu.csv", "v1"))
+    # Newer on disk, but not the version being replaced.
+    stray = clusters.model_path("Menu.csv", "v0")
+    clusters.save_model(clusters.fit_model(hashes, X, k=5), stray)
+    os.utime(stray, ns=(2**62, 2**62))
+
+    X2 = X.copy()
+    X2[:3] += 0.5
+    model = clusters.load_model("Menu.csv", "v2", hashes, X2, previous="v1")
+    assert model.k == 3
+    assert sorted(p.name for p in model_dir.iterdir()) == ["v2.npz"]
+    np.testing.assert_array_equal(clusters.read_model(model_dir / "v2.npz").centers, model.centers)
+
+
+def test_restart_updates_the_only_saved_model(model_dir):
+    hashes, X = body_features()
+    clusters.save_model(clusters.fit_model(hashes, X, k=5), clusters.model_path("Menu.csv", "v1"))
+
+    assert clusters.load_model("Menu.csv", "v2", hashes, X).k == 5  # No previous version in a new process
+    assert sorted(p.name for p in model_dir.iterdir()) == ["v2.npz"]
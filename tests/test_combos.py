@@ -0,0 +1,49 @@
+"""Combo search (happy.combos) against brute force over every combo of tiny instances."""
+import itertools
+
+import numpy as np
+import pytest
+
+from happy import combos
+
+
+def brute_force(groups, caps):
+    """Best summed goodness of any combo within ``caps`` (None when nothing fits)."""
+    best = None
+    per_group = [itertools.combinations(range(len(goodness)), copies) for goodness, _, copies in groups]
+    for picks in itertools.product(*per_group):
+        cost = sum(costs[list(p)].sum(axis=0) for p, (_, costs, _) in zip(picks, groups))
+        if (cost <= caps).all():
+            score = sum(goodness[list(p)].sum() for p, (goodness, _, _) in zip(picks, groups))
+            best = score if best is None else max(best, score)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_search_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n_caps = int(rng.integers(0, 4))
+    groups = []
+    for _ in range(int(rng.integers(1, 4))):
+        size = int(rng.integers(1, 9))
+        goodness = rng.normal(size=size).round(1)  # Ties between items
+        costs = rng.integers(0, 10, (size, n_caps)).astype(float)
+        groups.append((goodness, costs, int(rng.integers(1, 3))))
+    caps = rng.integers(0, 30, n_caps).astype(float)
+
+    positions, exact = combos.search(groups, caps)
+    best = brute_force(groups, caps)
+    assert exact
+    if best is None:
+        assert positions is None
+        return
+
+    assert positions is not None
+    cost = np.zeros(n_caps)
+    score = 0.0
+    for picks, (goodness, costs, copies) in zip(positions, groups):
+        assert len(picks) == copies and len(set(picks)) == copies  # Distinct items per slot
+        cost += costs[picks].sum(axis=0)
+        score += goodness[picks].sum()
+    assert (cost <= caps).all()
+    assert score >= best - combos.GAP
@@ -0,0 +1,79 @@
+"""Incremental menu reloads (happy.menu_store, features, scoring) against full rebuilds."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from happy import features, menu_store
+from happy.scoring import ScoringEngine, load_engine
+
+NUTRIENTS = ["Energy (kCal)", "Protein (g)", "Total Sugars (g)", "Sodium (mg)"]
+
+
+def edited(menu, rng, widen):
+    """A new version of ``menu``: edited nutrients and sizes, dropped, copied and new rows."""
+    df = menu.copy()
+    rows = rng.choice(len(df), 10, replace=False)
+    df.loc[rows, NUTRIENTS] = df.loc[rows, NUTRIENTS] * 0.9  # Inside the old extremes
+    sizes = rng.choice(len(df), 10, replace=False)
+    df.loc[sizes, "Per Serve Size"] = rng.choice(["1 pc", "250 g", "330 ml", "2 pcs", "n/a"], 10)
+    df = df.drop(index=rng.choice(len(df), 5, replace=False))
+    new = df.sample(5, random_state=int(rng.integers(1 << 31))).assign(**{"Menu Items": "New item"})
+    if widen:
+        new[NUTRIENTS] = new[NUTRIENTS] * 10  # Moves the extremes
+    return pd.concat([df, df.iloc[:3], new], ignore_index=True)
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("widen", [False, True])
+def test_incremental_features_and_scores_equal_full_rebuild(seed, widen):
+    rng = np.random.default_rng(seed)
+    old = menu_store.parse_menu(menu_store.resolve_path(menu_store.MENU_FILE))
+    new = edited(old, rng, widen)
+    matches = menu_store.match_rows(menu_store.row_hashes(old), menu_store.row_hashes(new))
+
+    old_featured = features.add_derived_columns(old)
+    featured = features.update_derived_columns(old_featured, new, matches)
+    full = features.add_derived_columns(new)
+    pd.testing.assert_frame_equal(featured, full)
+
+    engine = ScoringEngine(full, previous=ScoringEngine(old_featured), matches=matches)
+    np.testing.assert_array_equal(engine.X, ScoringEngine(full).X)
+    pd.testing.assert_frame_equal(engine.scores(), ScoringEngine(full).scores())
+
+
+def test_store_reload_equals_fresh_load(tmp_path):
+    path = tmp_path / "Test_Menu.csv"
+    menu = menu_store.parse_menu(menu_store.resolve_path(menu_store.MENU_FILE))
+    menu.to_csv(path, index=False)
+    load_engine(str(path))  # Builds the version the next one is updated from
+    first = menu_store.menu_version(str(path))
+
+    edited(menu, np.random.default_rng(0), widen=True).to_csv(path, index=False)
+    reloaded = load_engine(str(path))
+    assert menu_store.row_matches(str(path), first) is not None  # Built over the first version
+
+    fresh = features.add_derived_columns(menu_store.parse_menu(path))
+    pd.testing.assert_frame_equal(menu_store.load_features(str(path)), fresh)
+    np.testing.assert_array_equal(reloaded.X, ScoringEngine(fresh).X)
+
+
+def test_kept_piece_count_row_follows_median_weight():
+    # India sizes are all g/ml, so give one kept row a size without a weight.
+    old = menu_store.parse_menu(menu_store.resolve_path(menu_store.MENU_FILE))
+    old.loc[5, "Per Serve Size"] = "2 pcs"
+    old_featured = features.add_derived_columns(old)
+
+    # Heavier servings of mid-density items move the median weight, not the extremes.
+    density = old_featured["energy_density"]
+    rows = old.index[(density > density.quantile(0.3)) & (density < density.quantile(0.7))][:25]
+    new = old.copy()
+    new.loc[rows, "Per Serve Size"] = [f"{w * 1.6:g} g" for w in old_featured.loc[rows, "serve_weight"]]
+    matches = menu_store.match_rows(menu_store.row_hashes(old), menu_store.row_hashes(new))
+    full = features.add_derived_columns(new)
+    assert matches[5] == 5
+    assert full.loc[5, "serve_weight"] != old_featured.loc[5, "serve_weight"]
+
+    engine = ScoringEngine(full, previous=ScoringEngine(old_featured), matches=matches)
+    assert ("energy_density", None, False) not in engine.rescaled
+    np.testing.assert_array_equal(engine.X, ScoringEngine(full).X)
+    pd.testing.assert_frame_equal(engine.scores(), ScoringEngine(full).scores())
@@ -0,0 +1,19 @@
+"""Per-region ingredients tables (happy.ingredients)."""
+from happy import ingredients, menu_store
+
+
+def test_each_region_reads_only_its_own_table(tmp_path):
+    menu = menu_store.parse_menu(menu_store.resolve_path(menu_store.MENU_FILE))
+    item = menu["Menu Items"].iloc[0]
+    for region in ("North", "South"):
+        menu.to_csv(tmp_path / f"{region}_Menu.csv", index=False)
+    (tmp_path / "North_Menu_Ingredients.csv").write_text(f"Menu Items,Ingredient,Allergen Group\n{item},cashew,nuts\n")
+
+    north, south = str(tmp_path / "North_Menu.csv"), str(tmp_path / "South_Menu.csv")
+    assert ingredients.table_path(str(tmp_path / "North_Menu_New.csv")) == tmp_path / "North_Menu_Ingredients.csv"
+    assert ingredients.table_version(north) is not None
+    assert ingredients.table_version(south) is None
+
+    nuts = menu["Menu Items"] == item
+    assert ingredients.allergen_columns(north).loc[nuts, "contains_nuts"].all()
+    assert not ingredients.allergen_columns(south).loc[nuts, "contains_nuts"].any()
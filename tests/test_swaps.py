@@ -0,0 +1,40 @@
+"""Healthier swaps (happy.swaps) against a brute-force scan of every better item."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from happy import swaps
+
+
+def brute_force(profiles, goodness, pos, top_n):
+    better = np.flatnonzero(goodness > goodness[pos])
+    distances = np.linalg.norm(profiles[better] - profiles[pos], axis=1)
+    order = np.lexsort((better, distances))[:top_n]
+    return better[order], distances[order]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("lower_is_better", [False, True])
+def test_neighbours_match_brute_force(monkeypatch, seed, lower_is_better):
+    monkeypatch.setattr(swaps, "DIRECT_MAX", 4)  # Many small blocks, so every path is taken
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 300))
+    profiles = rng.random((n, 3))
+    scores = rng.random(n).round(2)  # Ties between scores
+    scores[rng.random(n) < 0.1] = np.nan
+    objective = "Diabetes_Score" if lower_is_better else "Lean_Score"
+    index = swaps.SwapIndex(
+        items=pd.DataFrame({"Menu Items": [f"item {i}" for i in range(n)], "Menu Category": "Regular Menu"}),
+        profiles=profiles, positions={}, scores=pd.DataFrame({objective: scores}),
+    )
+    goodness = np.nan_to_num(-scores if lower_is_better else scores, nan=-np.inf)
+
+    for pos in range(n):
+        for top_n in (1, 5):
+            found, distances = index.neighbours(pos, objective, top_n)
+            if np.isnan(scores[pos]):
+                assert not len(found)
+                continue
+            expected, expected_distances = brute_force(profiles, goodness, pos, top_n)
+            np.testing.assert_allclose(distances, expected_distances)
+            np.testing.assert_array_equal(found, expected)
@@ -0,0 +1,30 @@
+"""Warm-up (happy.warmup) with a region whose menu files cannot be read."""
+import json
+
+import pytest
+
+from happy import api, catalog, menu_store, warmup
+
+
+@pytest.fixture
+def broken_region(tmp_path, monkeypatch):
+    for name in ("Broken_Menu.csv", "Broken_Menu_New.csv"):
+        (tmp_path / name).write_text("Menu Items,Energy (kCal)\nBurger,lots\n")
+    monkeypatch.setattr(catalog, "MENU_DIRS", [menu_store.ROOT, tmp_path])
+    monkeypatch.setattr(menu_store, "watch", lambda names, on_change=None: None)
+    monkeypatch.setattr(warmup, "_status", dict(warmup._status))
+    assert "Broken" in catalog.regions()
+
+
+def test_bad_region_ends_degraded_and_ready(broken_region, tmp_path):
+    ready_file = tmp_path / "ready.json"
+    warmup._run(ready_file)
+
+    status = warmup.status()
+    assert status["state"] == "degraded"
+    assert "Broken" in status["error"]
+    assert warmup.is_ready()
+    assert json.loads(ready_file.read_text())["state"] == "degraded"
+
+    assert api.dispatch("GET", "/ready")[0] == 200
+    assert api.dispatch("GET", "/recommend/mood?rating=2&category=Veg")[0] == 200